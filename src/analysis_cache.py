@@ -0,0 +1,130 @@
+"""
+Content-addressed cache of per-article relevance and sentiment results.
+"""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from models import NewsCategory, Sentiment
+from config import ANALYSIS_CACHE_SIZE, ANALYSIS_CACHE_DISK_ENTRIES, ANALYSIS_CACHE_COMMIT_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+def analysis_key(title: str, content: str, category: NewsCategory, config_version: str) -> bytes:
+    """Digest of everything a relevance score and sentiment depend on."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (config_version, category.value, title, content):
+        encoded = part.encode('utf-8')
+        # Length-prefix each part so field boundaries cannot collide
+        digest.update(len(encoded).to_bytes(8, 'big'))
+        digest.update(encoded)
+    return digest.digest()
+
+class AnalysisCache:
+    """LRU cache of (relevance score, sentiment), optionally backed by a SQLite file.
+
+    Keys include the scoring config version, so results computed under an
+    older keyword config are never returned and age out of both tiers.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_SIZE, path: str = None,
+                 max_disk_entries: int = ANALYSIS_CACHE_DISK_ENTRIES):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: 'OrderedDict[bytes, Tuple[float, Sentiment]]' = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._pending_writes = 0
+
+        self._connection = None
+        if path:
+            import sqlite3  # Only disk-backed caches pay for loading SQLite
+            self._connection = sqlite3.connect(path)
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis ("
+                    "key BLOB PRIMARY KEY, relevance_score REAL NOT NULL, "
+                    "sentiment TEXT NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._connection.execute(
+                    "CREATE INDEX IF NOT EXISTS analysis_last_used ON analysis (last_used)"
+                )
+
+    def get(self, key: bytes) -> Optional[Tuple[float, Sentiment]]:
+        """Return the cached (score, sentiment) for a key, or None."""
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return result
+
+        if self._connection is not None:
+            row = self._connection.execute(
+                "SELECT relevance_score, sentiment FROM analysis WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                result = (row[0], Sentiment(row[1]))
+                self._connection.execute(
+                    "UPDATE analysis SET last_used = ? WHERE key = ?", (time.time(), key)
+                )
+                self._remember(key, result)
+                self.hits += 1
+                self.disk_hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key: bytes, relevance_score: float, sentiment: Sentiment) -> None:
+        """Store a computed result in memory and, if configured, on disk."""
+        self._remember(key, (relevance_score, sentiment))
+
+        if self._connection is not None:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO analysis VALUES (?, ?, ?, ?)",
+                (key, relevance_score, sentiment.value, time.time())
+            )
+            self._pending_writes += 1
+            if self._pending_writes >= ANALYSIS_CACHE_COMMIT_INTERVAL:
+                self.flush()
+
+    def _remember(self, key: bytes, result: Tuple[float, Sentiment]) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def flush(self) -> None:
+        """Commit pending disk writes and trim the disk tier to its size bound."""
+        if self._connection is None:
+            return
+
+        count = self._connection.execute("SELECT COUNT(*) FROM analysis").fetchone()[0]
+        if count > self.max_disk_entries:
+            self._connection.execute(
+                "DELETE FROM analysis WHERE key IN "
+                "(SELECT key FROM analysis ORDER BY last_used LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+            logger.info(f"Evicted {count - self.max_disk_entries} cached analysis results")
+        self._connection.commit()
+        self._pending_writes = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the overall hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory)
+        }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self.flush()
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,335 @@
+"""
+Append-only, memory-mapped on-disk archive of articles.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from models import (
+    Article, ArticleBatch, _CATEGORIES, _CATEGORY_CODES, _SENTIMENTS, _SENTIMENT_CODES,
+    _KEYWORD_SEPARATOR
+)
+from config import ARCHIVE_PATH, ARCHIVE_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b'NEWSARC1'
+# heap offset, title/content/url/keywords byte lengths, timestamp, score,
+# source code, category code, sentiment code, processed flag
+_RECORD = struct.Struct('<QIIIIddHBBB3x')
+
+class _Mapping:
+    """A read-only mmap of a file that may still be growing."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.map: Optional[mmap.mmap] = None
+        self.view: Optional[memoryview] = None
+
+    def refresh(self) -> None:
+        size = os.path.getsize(self.path)
+        if self.map is not None and len(self.map) == size:
+            return
+        self.close()
+        if size:
+            with open(self.path, 'rb') as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.map)
+
+    def close(self) -> None:
+        if self.view is not None:
+            self.view.release()
+            self.view = None
+        if self.map is not None:
+            try:
+                self.map.close()
+            except BufferError:
+                pass  # Views handed out by title_bytes() are still alive; unmapped on collection
+            self.map = None
+
+def _record_end(index_map: mmap.mmap, article_id: int) -> int:
+    """Heap offset just past the strings of a record."""
+    record = _RECORD.unpack_from(index_map, len(_MAGIC) + article_id * _RECORD.size)
+    return record[0] + sum(record[1:5])
+
+def _sync(path: str) -> None:
+    with open(path, 'rb') as f:
+        os.fsync(f.fileno())
+
+class ArticleArchive:
+    """Append-only article archive with random access by id.
+
+    Each article is a fixed-size record in PATH.idx pointing into a string
+    heap in PATH.heap; source names live in PATH.sources. Compaction writes
+    a new generation of the three files, PATH.<n>.*, and switches to it by
+    atomically replacing PATH.manifest. Both data files are memory-mapped,
+    so reading an article only touches its record and its strings, and
+    title_bytes/content_bytes return zero-copy views.
+    Article ids are record positions, assigned in append order.
+
+    Timestamps, sources and categories are loaded into compact arrays on
+    open, so date-range and source queries never decode text. Date lookups
+    use binary search while articles are appended in publication order.
+    """
+
+    def __init__(self, path: str = ARCHIVE_PATH):
+        self.path = path
+        self._manifest_path = f"{path}.manifest"
+        self._open()
+
+    def _generation_prefix(self, generation: int) -> str:
+        return self.path if generation == 0 else f"{self.path}.{generation}"
+
+    def _remove_generation(self, generation: int) -> None:
+        prefix = self._generation_prefix(generation)
+        for suffix in ('.idx', '.heap', '.sources'):
+            if os.path.exists(f"{prefix}{suffix}"):
+                os.remove(f"{prefix}{suffix}")
+
+    def _open(self) -> None:
+        """Map the current generation's files and load the id-indexed columns."""
+        self._generation = 0
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                self._generation = json.load(f)['generation']
+        prefix = self._generation_prefix(self._generation)
+        self._index_path = f"{prefix}.idx"
+        self._heap_path = f"{prefix}.heap"
+        self._sources_path = f"{prefix}.sources"
+        if self._generation:
+            # Left behind if a compaction stopped between the switch and the cleanup
+            self._remove_generation(self._generation - 1)
+
+        for file_path in (self._index_path, self._heap_path, self._sources_path):
+            if not os.path.exists(file_path):
+                open(file_path, 'wb').close()
+        if os.path.getsize(self._index_path) == 0:
+            with open(self._index_path, 'wb') as f:
+                f.write(_MAGIC)
+
+        self._index = _Mapping(self._index_path)
+        self._heap = _Mapping(self._heap_path)
+        self._index.refresh()
+        self._heap.refresh()
+        if self._index.map[:len(_MAGIC)] != _MAGIC:
+            self._index.close()
+            raise ValueError(f"{self._index_path} is not an article archive index")
+
+        with open(self._sources_path, 'r', encoding='utf-8') as f:
+            self.sources: List[str] = [json.loads(line) for line in f if line.strip()]
+        self._source_codes: Dict[str, int] = {source: code for code, source in enumerate(self.sources)}
+
+        self.timestamps = array('d')
+        self.source_codes = array('H')
+        self.category_codes = array('B')
+        self._chronological = True
+        self._heap_size = os.path.getsize(self._heap_path)
+        records = (len(self._index.map) - len(_MAGIC)) // _RECORD.size
+        # Records whose strings never reached the heap, e.g. an index flushed
+        # to disk before the heap, are dropped like a half-written record
+        while records and _record_end(self._index.map, records - 1) > self._heap_size:
+            records -= 1
+        records_end = len(_MAGIC) + records * _RECORD.size
+        if records_end < len(self._index.map):
+            logger.warning(f"Truncating {self._index_path} after {records} complete records")
+            self._index.close()
+            os.truncate(self._index_path, records_end)
+            self._index.refresh()
+        with self._index.view[len(_MAGIC):records_end] as records_view:
+            for record in _RECORD.iter_unpack(records_view):
+                self._remember(record[5], record[7], record[8])
+
+        self._index_file = open(self._index_path, 'ab')
+        self._heap_file = open(self._heap_path, 'ab')
+        self._sources_file = open(self._sources_path, 'a', encoding='utf-8')
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __enter__(self) -> 'ArticleArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _remember(self, timestamp: float, source_code: int, category_code: int) -> None:
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self._chronological = False
+        self.timestamps.append(timestamp)
+        self.source_codes.append(source_code)
+        self.category_codes.append(category_code)
+
+    def append(self, article: Article) -> int:
+        """Append an article and return its id; publication dates must be naive local time."""
+        if article.publication_date.tzinfo is not None:
+            # Timestamps are stored without an offset and read back as naive local time
+            raise ValueError(f"Cannot archive timezone-aware date {article.publication_date} of '{article.title}'; "
+                             f"convert it to naive local time first")
+        source_code = self._source_codes.get(article.source)
+        if source_code is None:
+            source_code = self._source_codes[article.source] = len(self.sources)
+            self.sources.append(article.source)
+            self._sources_file.write(json.dumps(article.source) + '\n')
+
+        fields = [text.encode('utf-8') for text in (article.title, article.content, article.url,
+                                                    _KEYWORD_SEPARATOR.join(article.keywords))]
+        timestamp = article.publication_date.timestamp()
+        category_code = _CATEGORY_CODES[article.category]
+        self._index_file.write(_RECORD.pack(
+            self._heap_size, *(len(field) for field in fields), timestamp, article.relevance_score,
+            source_code, category_code, _SENTIMENT_CODES[article.sentiment], article.processed
+        ))
+        for field in fields:
+            self._heap_file.write(field)
+            self._heap_size += len(field)
+
+        self._remember(timestamp, source_code, category_code)
+        self._dirty = True
+        return len(self) - 1
+
+    def extend(self, articles: Iterable[Article]) -> range:
+        """Append articles and return the range of their ids."""
+        first = len(self)
+        for article in articles:
+            self.append(article)
+        return range(first, len(self))
+
+    def flush(self) -> None:
+        """Write appended articles to disk and make them readable."""
+        if not self._dirty:
+            return
+        for f in (self._sources_file, self._heap_file, self._index_file):
+            f.flush()
+        self._index.refresh()
+        self._heap.refresh()
+        self._dirty = False
+
+    def _record(self, article_id: int) -> tuple:
+        if not 0 <= article_id < len(self):
+            raise IndexError(f"No article with id {article_id}")
+        self.flush()
+        return _RECORD.unpack_from(self._index.map, len(_MAGIC) + article_id * _RECORD.size)
+
+    def _fields(self, record: tuple) -> List[memoryview]:
+        views = []
+        offset = record[0]
+        for length in record[1:5]:
+            views.append(self._heap.view[offset:offset + length] if length else memoryview(b''))
+            offset += length
+        return views
+
+    def title_bytes(self, article_id: int) -> memoryview:
+        """UTF-8 title of an article, as a view into the mapped heap."""
+        return self._fields(self._record(article_id))[0]
+
+    def content_bytes(self, article_id: int) -> memoryview:
+        """UTF-8 content of an article, as a view into the mapped heap."""
+        return self._fields(self._record(article_id))[1]
+
+    def get(self, article_id: int) -> Article:
+        """Load one article by id."""
+        record = self._record(article_id)
+        title, content, url, keywords = (str(field, 'utf-8') for field in self._fields(record))
+        article = Article(
+            title=title,
+            source=self.sources[record[7]],
+            publication_date=datetime.fromtimestamp(record[5]),
+            content=content,
+            category=_CATEGORIES[record[8]],
+            keywords=keywords.split(_KEYWORD_SEPARATOR) if keywords else [],
+            url=url
+        )
+        article.relevance_score = record[6]
+        article.sentiment = _SENTIMENTS[record[9]]
+        article.processed = bool(record[10])
+        return article
+
+    __getitem__ = get
+
+    def ids_between(self, start: datetime = None, end: datetime = None) -> List[int]:
+        """Ids of articles published in [start, end), in id order."""
+        low = start.timestamp() if start else float('-inf')
+        high = end.timestamp() if end else float('inf')
+        if self._chronological:
+            return list(range(bisect_left(self.timestamps, low), bisect_left(self.timestamps, high)))
+        return [article_id for article_id, timestamp in enumerate(self.timestamps) if low <= timestamp < high]
+
+    def ids_from_sources(self, sources: Iterable[str]) -> List[int]:
+        """Ids of articles from any of the given sources, in id order."""
+        codes = {self._source_codes[source] for source in sources if source in self._source_codes}
+        return [article_id for article_id, code in enumerate(self.source_codes) if code in codes]
+
+    def select(self, start: datetime = None, end: datetime = None,
+               sources: Iterable[str] = None) -> List[int]:
+        """Ids of articles matching a date range and, optionally, a set of sources."""
+        ids = self.ids_between(start, end)
+        if sources is not None:
+            codes = {self._source_codes[source] for source in sources if source in self._source_codes}
+            source_codes = self.source_codes
+            ids = [article_id for article_id in ids if source_codes[article_id] in codes]
+        return ids
+
+    def iter_articles(self, ids: Iterable[int] = None) -> Iterator[Article]:
+        """Lazily load articles, all of them by default.
+
+        The result can be passed straight to NewsFilter.process_articles
+        or stream_articles.
+        """
+        return (self.get(article_id) for article_id in (range(len(self)) if ids is None else ids))
+
+    def query(self, start: datetime = None, end: datetime = None,
+              sources: Iterable[str] = None) -> Iterator[Article]:
+        """Lazily load articles matching a date range and optional sources."""
+        return self.iter_articles(self.select(start, end, sources))
+
+    def to_batch(self, ids: Iterable[int] = None) -> ArticleBatch:
+        """Load articles into columnar storage, e.g. for MagazineCompiler.compile_magazine."""
+        return ArticleBatch.from_articles(self.iter_articles(ids))
+
+    def compact(self, retention_days: int = ARCHIVE_RETENTION_DAYS, now: datetime = None) -> int:
+        """Rewrite the archive without articles older than the retention window.
+
+        Ids of the remaining articles are renumbered from zero. Returns the
+        number of articles dropped.
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=retention_days)
+        keep = self.ids_between(start=cutoff)
+        dropped = len(self) - len(keep)
+        if not dropped:
+            return 0
+
+        generation = self._generation + 1
+        # Leftovers of a compaction that stopped before the switch
+        self._remove_generation(generation)
+        prefix = self._generation_prefix(generation)
+        with ArticleArchive(prefix) as compacted:
+            compacted.extend(self.iter_articles(keep))
+        for suffix in ('.idx', '.heap', '.sources'):
+            _sync(f"{prefix}{suffix}")
+
+        # Replacing the manifest is the single atomic switch to the new generation
+        self.close()
+        temporary_path = f"{self._manifest_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump({'generation': generation}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, self._manifest_path)
+        self._open()
+        logger.info(f"Compacted archive {self.path}: dropped {dropped} articles older than {cutoff}")
+        return dropped
+
+    def close(self) -> None:
+        if self._index_file.closed:
+            return
+        self.flush()
+        for f in (self._sources_file, self._heap_file, self._index_file):
+            f.close()
+        self._index.close()
+        self._heap.close()
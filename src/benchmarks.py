@@ -0,0 +1,322 @@
+"""
+Benchmarks for the news processing pipeline.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Set, Tuple
+from models import Article, ArticleBatch
+from filters import NewsFilter
+from compiler import MagazineCompiler
+from profiling import PipelineProfiler
+from synthetic import generate_synthetic_articles
+from ingest import FeedReader, write_feed
+from matching import save_compiled
+import similarity
+
+BASELINE_PATH = 'benchmark_baseline.json'
+REGRESSION_TOLERANCE = 0.25  # Allowed slowdown before a stage is flagged
+MIN_COMPARED_SECONDS = 0.01  # Stages faster than this are too noisy to compare
+
+def _duplicate_pairs(groups: List[List[Article]]) -> Set[Tuple[int, int]]:
+    pairs = set()
+    for group in groups:
+        seed = id(group[0])
+        pairs.update((seed, id(article)) for article in group[1:])
+    return pairs
+
+def benchmark_duplicate_detection(sizes: List[int] = None) -> None:
+    """Compare LSH candidate generation against brute-force pairwise detection."""
+    sizes = sizes or [250, 500, 1000]
+    news_filter = NewsFilter()
+
+    print(f"{'articles':>9} {'exact s':>9} {'lsh s':>9} {'speedup':>8} {'recall':>7}")
+    for size in sizes:
+        articles = list(generate_synthetic_articles(size, duplicate_rate=0.2))
+
+        start = time.perf_counter()
+        exact_groups = news_filter.detect_duplicates(articles, method='exact')
+        exact_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lsh_groups = news_filter.detect_duplicates(articles, method='lsh')
+        lsh_seconds = time.perf_counter() - start
+
+        exact_pairs = _duplicate_pairs(exact_groups)
+        recall = len(exact_pairs & _duplicate_pairs(lsh_groups)) / len(exact_pairs) if exact_pairs else 1.0
+        print(f"{size:>9} {exact_seconds:>9.2f} {lsh_seconds:>9.2f} "
+              f"{exact_seconds / lsh_seconds:>7.1f}x {recall:>7.1%}")
+
+def benchmark_parallel_scoring(size: int = 20000, worker_counts: List[int] = None) -> None:
+    """Time relevance and sentiment scoring across process pool sizes."""
+    cpu_count = os.cpu_count() or 1
+    worker_counts = worker_counts or sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+    articles = list(generate_synthetic_articles(size, duplicate_rate=0.0))
+    news_filter = NewsFilter()
+
+    print(f"{'workers':>8} {'seconds':>9} {'articles/s':>11} {'speedup':>8}")
+    serial_seconds = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        news_filter.process_articles(articles, remove_duplicates=False, workers=workers)
+        seconds = time.perf_counter() - start
+        serial_seconds = serial_seconds or seconds
+        print(f"{workers:>8} {seconds:>9.2f} {size / seconds:>11.0f} {serial_seconds / seconds:>7.1f}x")
+
+def benchmark_similarity_backends(sizes: List[int] = None, exact_limit: int = 500) -> None:
+    """Compare TF-IDF cosine grouping with the difflib-based exact and LSH paths.
+
+    Brute-force difflib timings above exact_limit articles are extrapolated
+    from a sample of pairs.
+    """
+    sizes = sizes or [1000, 10000, 100000]
+    news_filter = NewsFilter()
+    backend = 'numpy' if similarity.np is not None else 'pure Python'
+    print(f"TF-IDF backend: {backend}")
+    print(f"{'articles':>9} {'exact s':>10} {'lsh s':>9} {'tfidf s':>9} {'vs lsh':>7} {'agreement':>10}")
+    for size in sizes:
+        articles = list(generate_synthetic_articles(size, duplicate_rate=0.2))
+
+        if size <= exact_limit:
+            start = time.perf_counter()
+            news_filter.detect_duplicates(articles, method='exact')
+            exact = f"{time.perf_counter() - start:.2f}"
+        else:
+            rng = random.Random(0)
+            sample = [rng.sample(articles, 2) for _ in range(2000)]
+            start = time.perf_counter()
+            for first, second in sample:
+                news_filter.calculate_similarity(first, second)
+            per_pair = (time.perf_counter() - start) / len(sample)
+            exact = f"~{per_pair * size * (size - 1) / 2:.0f}"
+
+        start = time.perf_counter()
+        lsh_groups = news_filter.detect_duplicates(articles, method='lsh')
+        lsh_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tfidf_groups = news_filter.detect_duplicates(articles, method='tfidf')
+        tfidf_seconds = time.perf_counter() - start
+
+        lsh_pairs = _duplicate_pairs(lsh_groups)
+        agreement = len(lsh_pairs & _duplicate_pairs(tfidf_groups)) / len(lsh_pairs) if lsh_pairs else 1.0
+        print(f"{size:>9} {exact:>10} {lsh_seconds:>9.2f} {tfidf_seconds:>9.2f} "
+              f"{lsh_seconds / tfidf_seconds:>6.1f}x {agreement:>10.1%}")
+
+def _traced_bytes(build) -> Tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current
+
+def benchmark_article_memory(size: int = 100000) -> None:
+    """Compare the memory held by a list of Articles and an equivalent ArticleBatch."""
+    def build_articles():
+        return list(generate_synthetic_articles(size, duplicate_rate=0.0))
+
+    def build_batch():
+        return ArticleBatch.from_articles(generate_synthetic_articles(size, duplicate_rate=0.0))
+
+    articles, article_bytes = _traced_bytes(build_articles)
+    del articles
+    batch, batch_bytes = _traced_bytes(build_batch)
+
+    print(f"{'representation':>15} {'MiB':>9} {'bytes/article':>14}")
+    for name, held in (('List[Article]', article_bytes), ('ArticleBatch', batch_bytes)):
+        print(f"{name:>15} {held / 2 ** 20:>9.1f} {held / size:>14.0f}")
+
+def benchmark_ingest(size: int = 100000, directory: str = None) -> None:
+    """Measure JSON Lines parse throughput for plain and gzipped feeds."""
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        print(f"{'feed':>12} {'MiB':>8} {'seconds':>9} {'MB/s':>8} {'articles/s':>11}")
+        for name in ('feed.jsonl', 'feed.jsonl.gz'):
+            path = os.path.join(tmp, name)
+            write_feed(generate_synthetic_articles(size), path)
+            reader = FeedReader(path)
+            for _ in reader:
+                pass
+            print(f"{name:>12} {reader.bytes_read / 2 ** 20:>8.1f} {reader.seconds:>9.2f} "
+                  f"{reader.megabytes_per_second:>8.1f} {reader.articles_read / reader.seconds:>11.0f}")
+
+def _import_times(module: str) -> Dict[str, int]:
+    """Cumulative import microseconds of a module and of each module it imports directly."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                               capture_output=True, text=True, check=True)
+    times = {}
+    for line in reversed(completed.stderr.splitlines()):
+        fields = line.split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # Names are indented two spaces per nesting level after a one-space margin
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0 and name.strip() != module:
+            if times:
+                break
+            continue
+        if depth <= 1:
+            times[name.strip()] = int(fields[1])
+    return times
+
+def _timed_in_fresh_process(code: str, directory: str) -> float:
+    """Seconds a fresh interpreter spends running code, excluding interpreter start-up."""
+    source_path = os.path.dirname(os.path.abspath(__file__))
+    timed = f"import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)"
+    completed = subprocess.run([sys.executable, '-c', timed], cwd=directory, capture_output=True,
+                               text=True, check=True, env={**os.environ, 'PYTHONPATH': source_path})
+    return float(completed.stdout.split()[-1])
+
+def benchmark_startup(runs: int = 5, top: int = 10) -> None:
+    """Measure cold start: what importing main costs, what tfidf runs add by loading NumPy,
+    and building a NewsFilter with and without the serialized matcher cache."""
+    times = _import_times('main')
+    print(f"{'import':>22} {'ms':>8}")
+    for name, microseconds in sorted(times.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"{name:>22} {microseconds / 1000:>8.1f}")
+
+    # Restarting the clock after the import times construction alone
+    construct = "from filters import NewsFilter\nstart = time.perf_counter()\nNewsFilter({})"
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'matchers.cache')
+        save_compiled(cache_path)
+        results = [('import filters', min(_timed_in_fresh_process('import filters', tmp) for _ in range(runs)))]
+        # Paid on top of the above only by runs that opt into tfidf deduplication
+        results.append(('import similarity', min(_timed_in_fresh_process('import similarity', tmp)
+                                                 for _ in range(runs))))
+        results.append(('NewsFilter()', min(_timed_in_fresh_process(construct.format(''), tmp)
+                                            for _ in range(runs))))
+        cached = construct.format(f"matcher_cache={cache_path!r}")
+        results.append(('NewsFilter(), cached', min(_timed_in_fresh_process(cached, tmp) for _ in range(runs))))
+    print(f"{'cold start':>22} {'ms':>8}")
+    for name, seconds in results:
+        print(f"{name:>22} {seconds * 1000:>8.2f}")
+
+def run_pipeline_benchmark(size: int, seed: int = 42, workers: int = 1,
+                           track_memory: bool = False, **corpus_options) -> Dict:
+    """Run the full pipeline over a synthetic corpus and return per-stage measurements."""
+    articles = list(generate_synthetic_articles(size, seed, **corpus_options))
+    profiler = PipelineProfiler(track_memory=track_memory)
+    news_filter = NewsFilter(profiler=profiler)
+    compiler = MagazineCompiler(profiler=profiler)
+
+    start = time.perf_counter()
+    processed = news_filter.process_articles(articles, workers=workers)
+    magazine = compiler.compile_magazine(processed)
+    compiler.write_html(magazine, io.StringIO())
+    seconds = time.perf_counter() - start
+
+    report = profiler.report()
+    profiler.stop()
+    return {
+        'size': size,
+        'seed': seed,
+        'workers': workers,
+        'seconds': round(seconds, 6),
+        'articles_per_second': round(size / seconds, 1),
+        'unique_articles': len(processed),
+        **report
+    }
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Dict]:
+    """Load stored results keyed by corpus size, or {} if there is no baseline yet."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(results: List[Dict], path: str = BASELINE_PATH) -> None:
+    baseline = load_baseline(path)
+    baseline.update({str(result['size']): result for result in results})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+def compare_to_baseline(result: Dict, baseline: Dict, tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """Describe every stage, total time or peak memory that regressed beyond tolerance."""
+    regressions = []
+    timings = [('total', result['seconds'], baseline['seconds'])]
+    for name, stats in result['stages'].items():
+        if name in baseline['stages']:
+            timings.append((name, stats['wall_seconds'], baseline['stages'][name]['wall_seconds']))
+
+    for name, seconds, baseline_seconds in timings:
+        if baseline_seconds >= MIN_COMPARED_SECONDS and seconds > baseline_seconds * (1 + tolerance):
+            regressions.append(f"{result['size']} articles: {name} took {seconds:.3f}s "
+                               f"(baseline {baseline_seconds:.3f}s, +{seconds / baseline_seconds - 1:.0%})")
+
+    memory, baseline_memory = result['peak_memory_bytes'], baseline['peak_memory_bytes']
+    if baseline_memory and memory > baseline_memory * (1 + tolerance):
+        regressions.append(f"{result['size']} articles: peak memory {memory / 2 ** 20:.1f} MiB "
+                           f"(baseline {baseline_memory / 2 ** 20:.1f} MiB)")
+
+    if result['counters'] != baseline['counters']:
+        regressions.append(f"{result['size']} articles: counters changed from "
+                           f"{baseline['counters']} to {result['counters']}")
+    return regressions
+
+def benchmark_pipeline(sizes: List[int] = None, seed: int = 42, workers: int = 1,
+                       baseline_path: str = BASELINE_PATH, update_baseline: bool = False,
+                       track_memory: bool = False) -> List[str]:
+    """Benchmark the pipeline at each size and return regressions against the baseline."""
+    sizes = sizes or [1000, 5000]
+    baseline = load_baseline(baseline_path)
+    results = []
+    regressions = []
+
+    print(f"{'articles':>9} {'seconds':>9} {'articles/s':>11} {'peak MiB':>9}  slowest stages")
+    for size in sizes:
+        result = run_pipeline_benchmark(size, seed, workers, track_memory)
+        results.append(result)
+        slowest = sorted(result['stages'].items(), key=lambda item: item[1]['wall_seconds'], reverse=True)[:3]
+        stages = ', '.join(f"{name} {stats['wall_seconds']:.2f}s" for name, stats in slowest)
+        print(f"{size:>9} {result['seconds']:>9.2f} {result['articles_per_second']:>11.0f} "
+              f"{result['peak_memory_bytes'] / 2 ** 20:>9.1f}  {stages}")
+        if str(size) in baseline:
+            regressions.extend(compare_to_baseline(result, baseline[str(size)]))
+
+    if update_baseline:
+        save_baseline(results, baseline_path)
+        print(f"Baseline written to {baseline_path}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the news processing pipeline.")
+    parser.add_argument('suite', nargs='?', default='micro', choices=['micro', 'pipeline', 'startup'],
+                        help="micro: component benchmarks; pipeline: end-to-end stage timings")
+    parser.add_argument('--sizes', type=int, nargs='+', help="Synthetic corpus sizes")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="Baseline results file")
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--track-memory', action='store_true',
+                        help="Measure peak Python allocations with tracemalloc (slower)")
+    args = parser.parse_args()
+
+    if args.suite == 'startup':
+        benchmark_startup()
+        sys.exit(0)
+    if args.suite == 'pipeline':
+        regressions = benchmark_pipeline(args.sizes, args.seed, args.workers, args.baseline,
+                                         args.update_baseline, args.track_memory)
+        sys.exit(1 if regressions and not args.update_baseline else 0)
+
+    benchmark_duplicate_detection()
+    benchmark_parallel_scoring()
+    benchmark_similarity_backends()
+    benchmark_article_memory()
+    benchmark_ingest()
+    benchmark_startup()
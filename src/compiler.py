@@ -1,33 +1,129 @@
 """
 Magazine compilation and output generation.
 """
+import bisect
+import heapq
+import io
+import itertools
+import json
 import logging
-from typing import List, Dict
+from typing import Iterable, List, Dict, Set, TextIO, Tuple, Union
 from datetime import datetime
 from collections import defaultdict
-from models import Article, NewsCategory, Sentiment
-from config import HTML_TEMPLATE, MAX_SUMMARY_LENGTH, ARTICLES_PER_SECTION
+from models import Article, ArticleBatch, ArticleView, NewsCategory, Sentiment
+from config import MAX_SUMMARY_LENGTH, ARTICLES_PER_SECTION
+from renderers import HtmlRenderer
+from profiling import PipelineProfiler, Profiled
+from ranking import RecencyDecay
 
 logger = logging.getLogger(__name__)
 
-class MagazineCompiler:
+# Order of sections in the compiled magazine
+SECTION_PRIORITY = [
+    NewsCategory.TOP_STORIES,
+    NewsCategory.FINANCE,
+    NewsCategory.TECHNOLOGY,
+    NewsCategory.WORLD_NEWS,
+    NewsCategory.POLITICS,
+    NewsCategory.HEALTH
+]
+
+class _RowKey:
+    """Title, source and URL of a batch row, decoded lazily for tie-breaking."""
+    
+    __slots__ = ('batch', 'index', '_key')
+    
+    def __init__(self, batch: ArticleBatch, index: int):
+        self.batch = batch
+        self.index = index
+        self._key = None
+    
+    def key(self) -> Tuple[str, str, str]:
+        if self._key is None:
+            self._key = (self.batch.title(self.index), self.batch.source(self.index), self.batch.url(self.index))
+        return self._key
+    
+    def __eq__(self, other: '_RowKey') -> bool:
+        return self.key() == other.key()
+    
+    def __lt__(self, other: '_RowKey') -> bool:
+        return self.key() < other.key()
+    
+    def __gt__(self, other: '_RowKey') -> bool:
+        return self.key() > other.key()
+
+class MagazineCompiler(Profiled):
     """Compiles filtered articles into a structured magazine format."""
     
-    def __init__(self):
+    def __init__(self, profiler: PipelineProfiler = None, recency: RecencyDecay = None):
         self.sections: Dict[NewsCategory, List[Article]] = defaultdict(list)
         self.section_summaries: Dict[NewsCategory, str] = {}
+        self.html_renderer = HtmlRenderer()
+        # Optional freshness bonus added to relevance when ranking within sections
+        self.recency = recency
+        if profiler is not None:
+            self.profiler = profiler
     
-    def organize_by_category(self, articles: List[Article]) -> Dict[NewsCategory, List[Article]]:
-        """Organize articles by category and limit per section."""
-        sections = defaultdict(list)
+    def _rank_key(self, article: Article) -> Tuple:
+        """Ordering of articles within a section; larger keys rank first."""
+        score = article.relevance_score if self.recency is None else self.recency.score(article)
+        return (score, article.publication_date, article.title, article.source, article.url)
+    
+    def organize_by_category(self, articles: Iterable[Article]) -> Dict[NewsCategory, List[Article]]:
+        """Organize articles by category, keeping the top ARTICLES_PER_SECTION of each.
+        
+        Selection is a single pass with a bounded heap per category, so the
+        input does not need to be sorted. Ties on relevance go to the newer
+        article, then fall back to title, source and URL, so the same
+        articles always produce the same sections.
+        """
+        heaps = defaultdict(list)
+        sequence = itertools.count()  # Only breaks ties between indistinguishable articles
         
         for article in articles:
-            if len(sections[article.category]) < ARTICLES_PER_SECTION:
-                sections[article.category].append(article)
+            heap = heaps[article.category]
+            entry = (self._rank_key(article), next(sequence), article)
+            if len(heap) < ARTICLES_PER_SECTION:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+        
+        # Best first within each category
+        sections = defaultdict(list)
+        for category, heap in heaps.items():
+            heap.sort(key=lambda entry: entry[0], reverse=True)
+            sections[category] = [article for _, _, article in heap]
+        
+        self.sections = sections
+        return sections
+    
+    def organize_batch(self, batch: ArticleBatch) -> Dict[NewsCategory, List[Article]]:
+        """Organize a columnar batch by category, materializing only the selected articles.
+        
+        Articles are ranked exactly as by organize_by_category, so both
+        return the same sections for the same articles in any order.
+        """
+        # Per-category bounded heaps of (score, timestamp, row key, -row); the
+        # title, source and URL behind a row key are only decoded to break ties
+        heaps = defaultdict(list)
+        scores = batch.scores
+        timestamps = batch.timestamps
+        bonus_at = self.recency.bonus_at if self.recency is not None else None
+        
+        for index, code in enumerate(batch.category_codes):
+            heap = heaps[code]
+            score = scores[index] if bonus_at is None else scores[index] + bonus_at(timestamps[index])
+            entry = (score, timestamps[index], _RowKey(batch, index), -index)
+            if len(heap) < ARTICLES_PER_SECTION:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
         
-        # Sort articles within each category by relevance score
-        for category in sections:
-            sections[category].sort(key=lambda x: x.relevance_score, reverse=True)
+        sections = defaultdict(list)
+        for heap in heaps.values():
+            for _, _, _, negative_index in sorted(heap, reverse=True):
+                article = batch.article(-negative_index)
+                sections[article.category].append(article)
         
         self.sections = sections
         return sections
@@ -70,48 +166,59 @@ class MagazineCompiler:
         
         return summary
     
-    def compile_magazine(self, articles: List[Article]) -> Dict:
-        """Compile articles into magazine format."""
+    def compile_magazine(self, articles: Union[List[Article], ArticleBatch]) -> Dict:
+        """Compile articles into magazine format.
+        
+        Section articles are read-only ArticleViews rather than dicts; use
+        to_serializable or format_json_output for a JSON-ready magazine.
+        """
         logger.info("Starting magazine compilation")
         
         # Organize articles by category
-        sections = self.organize_by_category(articles)
+        with self.profiler.stage('organize', len(articles)):
+            if isinstance(articles, ArticleBatch):
+                sections = self.organize_batch(articles)
+            else:
+                sections = self.organize_by_category(articles)
         
         # Generate section summaries
-        for category, section_articles in sections.items():
-            self.section_summaries[category] = self.generate_section_summary(section_articles)
+        with self.profiler.stage('summaries', len(sections)):
+            for category, section_articles in sections.items():
+                self.section_summaries[category] = self.generate_section_summary(section_articles)
         
+        magazine = self._assemble_magazine(len(articles))
+        
+        logger.info(f"Magazine compilation completed with {len(sections)} sections")
+        return magazine
+    
+    def _assemble_magazine(self, total_articles: int) -> Dict:
+        """Build the magazine structure from the current sections and summaries."""
         # Create magazine structure
         magazine = {
             'title': 'Daily News Digest',
             'date': datetime.now().strftime('%B %d, %Y'),
-            'total_articles': len(articles),
+            'total_articles': total_articles,
             'sections': {}
         }
         
         # Add sections in priority order
-        section_priority = [
-            NewsCategory.TOP_STORIES,
-            NewsCategory.FINANCE,
-            NewsCategory.TECHNOLOGY,
-            NewsCategory.WORLD_NEWS,
-            NewsCategory.POLITICS,
-            NewsCategory.HEALTH
-        ]
-        
-        for category in section_priority:
-            if category in sections:
+        for category in SECTION_PRIORITY:
+            if category in self.sections:
+                section_articles = self.sections[category]
                 magazine['sections'][category.value] = {
                     'summary': self.section_summaries[category],
-                    'articles': [article.to_dict() for article in sections[category]],
-                    'article_count': len(sections[category])
+                    'articles': [ArticleView(article) for article in section_articles],
+                    'article_count': len(section_articles)
                 }
         
-        logger.info(f"Magazine compilation completed with {len(sections)} sections")
         return magazine
     
     def format_console_output(self, magazine: Dict) -> str:
         """Format magazine content for console display."""
+        with self.profiler.stage('render_console', magazine['total_articles']):
+            return self._format_console_output(magazine)
+    
+    def _format_console_output(self, magazine: Dict) -> str:
         output = []
         output.append("=" * 80)
         output.append(f"📰 {magazine['title'].upper()}")
@@ -129,20 +236,20 @@ class MagazineCompiler:
             output.append("")
             
             # Articles
-            for i, article_data in enumerate(section_data['articles'], 1):
+            for i, article in enumerate(section_data['articles'], 1):
                 sentiment_emoji = {
-                    'positive': '😊',
-                    'negative': '😟',
-                    'neutral': '😐'
+                    Sentiment.POSITIVE: '😊',
+                    Sentiment.NEGATIVE: '😟',
+                    Sentiment.NEUTRAL: '😐'
                 }
                 
-                output.append(f"{i}. {article_data['title']}")
-                output.append(f"   📰 Source: {article_data['source']} | "
-                            f"🎯 Relevance: {article_data['relevance_score']:.2f} | "
-                            f"{sentiment_emoji[article_data['sentiment']]} {article_data['sentiment'].title()}")
-                output.append(f"   📄 {article_data['content'][:150]}...")
-                if article_data['keywords']:
-                    output.append(f"   🔑 Keywords: {', '.join(article_data['keywords'][:5])}")
+                output.append(f"{i}. {article.title}")
+                output.append(f"   📰 Source: {article.source} | "
+                            f"🎯 Relevance: {article.relevance_score:.2f} | "
+                            f"{sentiment_emoji[article.sentiment]} {article.sentiment.value.title()}")
+                output.append(f"   📄 {article.content[:150]}...")
+                if article.keywords:
+                    output.append(f"   🔑 Keywords: {', '.join(article.keywords[:5])}")
                 output.append("")
         
         output.append("=" * 80)
@@ -150,62 +257,138 @@ class MagazineCompiler:
     
     def format_html_output(self, magazine: Dict) -> str:
         """Format magazine content as HTML."""
-        content_parts = []
-        
-        # Header
-        content_parts.append('<div class="header">')
-        content_parts.append(f'<h1>📰 {magazine["title"]}</h1>')
-        content_parts.append(f'<div class="date">{magazine["date"]} | Total Articles: {magazine["total_articles"]}</div>')
-        content_parts.append('</div>')
-        
-        # Sections
-        for section_name, section_data in magazine['sections'].items():
-            content_parts.append('<div class="section">')
-            content_parts.append(f'<h2 class="section-title">🔹 {section_name}</h2>')
-            
-            # Section summary
-            content_parts.append(f'<div class="summary">{section_data["summary"]}</div>')
-            
-            # Articles
-            for article_data in section_data['articles']:
-                content_parts.append('<div class="article">')
-                
-                # Title and meta
-                content_parts.append(f'<div class="article-title">{article_data["title"]}</div>')
-                content_parts.append(
-                    f'<div class="article-meta">'
-                    f'📰 {article_data["source"]} | '
-                    f'📅 {datetime.fromisoformat(article_data["publication_date"]).strftime("%B %d, %Y %H:%M")}'
-                    f'<span class="relevance-score">Score: {article_data["relevance_score"]:.2f}</span>'
-                    f'</div>'
-                )
-                
-                # Content
-                content_parts.append(f'<div class="article-content">{article_data["content"]}</div>')
-                
-                # Tags
-                if article_data['keywords']:
-                    content_parts.append('<div class="tags">')
-                    for keyword in article_data['keywords'][:5]:
-                        content_parts.append(f'<span class="tag">{keyword}</span>')
-                    
-                    # Sentiment tag
-                    sentiment = article_data['sentiment']
-                    content_parts.append(f'<span class="tag sentiment-{sentiment}">{sentiment.title()}</span>')
-                    content_parts.append('</div>')
-                
-                content_parts.append('</div>')  # Close article
-            
-            content_parts.append('</div>')  # Close section
-        
-        return HTML_TEMPLATE.format(
-            date=magazine['date'],
-            content=''.join(content_parts)
+        buffer = io.StringIO()
+        self.write_html(magazine, buffer)
+        return buffer.getvalue()
+    
+    def write_html(self, magazine: Dict, out: TextIO) -> None:
+        """Stream magazine HTML to a file-like object without building the document in memory."""
+        sections = (
+            (section_name, section_data['summary'], section_data['articles'])
+            for section_name, section_data in magazine['sections'].items()
         )
+        with self.profiler.stage('render_html', magazine['total_articles']):
+            self.html_renderer.render(out, magazine['title'], magazine['date'],
+                                      magazine['total_articles'], sections)
+    
+    def to_serializable(self, magazine: Dict) -> Dict:
+        """Return a copy of the magazine with article views serialized to dicts."""
+        return {
+            **magazine,
+            'sections': {
+                section_name: {**section_data,
+                               'articles': [article.to_dict() for article in section_data['articles']]}
+                for section_name, section_data in magazine['sections'].items()
+            }
+        }
+    
+    def format_json_output(self, magazine: Dict) -> str:
+        """Format magazine content as JSON."""
+        return json.dumps(self.to_serializable(magazine), ensure_ascii=False, indent=2)
     
     def export_magazine(self, magazine: Dict, format_type: str = 'console') -> str:
         """Export magazine in specified format."""
         if format_type == 'html':
             return self.format_html_output(magazine)
+        elif format_type == 'json':
+            return self.format_json_output(magazine)
         else:
-            return self.format_console_output(magazine)
\ No newline at end of file
+            return self.format_console_output(magazine)
+
+class IncrementalMagazineCompiler(MagazineCompiler):
+    """Keeps a compiled magazine up to date as articles arrive and expire.
+    
+    Every category keeps all of its articles in rank order, so insertions and
+    removals only touch that category. A section's summary and cached HTML
+    fragment are regenerated only when its top ARTICLES_PER_SECTION change.
+    Articles are ranked by their score at insertion time; remove and re-add
+    an article to re-rank it.
+    """
+    
+    def __init__(self, profiler: PipelineProfiler = None, recency: RecencyDecay = None):
+        super().__init__(profiler, recency)
+        # Per category, ascending by rank; the section is the tail, reversed
+        self._ranked: Dict[NewsCategory, List[Tuple]] = defaultdict(list)
+        self._entries: Dict[int, Tuple] = {}
+        self._sequence = itertools.count()
+        self._fragments: Dict[NewsCategory, str] = {}
+        self.dirty_sections: Set[NewsCategory] = set()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add_articles(self, articles: Iterable[Article]) -> Set[NewsCategory]:
+        """Insert articles not yet in the magazine; return the sections that changed."""
+        touched = set()
+        for article in articles:
+            if id(article) in self._entries:
+                continue
+            entry = (self._rank_key(article), next(self._sequence), article)
+            bisect.insort(self._ranked[article.category], entry)
+            self._entries[id(article)] = entry
+            touched.add(article.category)
+        return self._refresh(touched)
+    
+    def remove_articles(self, articles: Iterable[Article]) -> Set[NewsCategory]:
+        """Remove articles from the magazine; return the sections that changed."""
+        touched = set()
+        for article in articles:
+            entry = self._entries.pop(id(article), None)
+            if entry is None:
+                continue
+            ranked = self._ranked[article.category]
+            del ranked[bisect.bisect_left(ranked, entry)]
+            touched.add(article.category)
+        return self._refresh(touched)
+    
+    def _refresh(self, categories: Set[NewsCategory]) -> Set[NewsCategory]:
+        changed = set()
+        for category in categories:
+            ranked = self._ranked[category]
+            top = [article for _, _, article in reversed(ranked[-ARTICLES_PER_SECTION:])]
+            current = self.sections.get(category, [])
+            if [id(article) for article in top] == [id(article) for article in current]:
+                continue
+            
+            if top:
+                self.sections[category] = top
+                self.section_summaries[category] = self.generate_section_summary(top)
+            else:
+                self.sections.pop(category, None)
+                self.section_summaries.pop(category, None)
+            self._fragments.pop(category, None)
+            changed.add(category)
+        
+        self.dirty_sections |= changed
+        return changed
+    
+    def compile_magazine(self, articles: Iterable[Article] = None) -> Dict:
+        """Add any new articles and return the current magazine."""
+        if articles is not None:
+            self.add_articles(articles)
+        return self._assemble_magazine(len(self._entries))
+    
+    def section_fragment(self, category: NewsCategory) -> str:
+        """Return the rendered HTML of one section, re-rendering only if it changed."""
+        fragment = self._fragments.get(category)
+        if fragment is None:
+            buffer = io.StringIO()
+            self.html_renderer.render_section(buffer, category.value, self.section_summaries[category],
+                                              self.sections[category])
+            fragment = self._fragments[category] = buffer.getvalue()
+        return fragment
+    
+    def pop_dirty_sections(self) -> Set[NewsCategory]:
+        """Return and clear the sections changed since the last call."""
+        dirty, self.dirty_sections = self.dirty_sections, set()
+        return dirty
+    
+    def write_html(self, magazine: Dict, out: TextIO) -> None:
+        """Stream magazine HTML, reusing cached fragments of unchanged sections."""
+        def write_sections(out: TextIO) -> None:
+            for section_name in magazine['sections']:
+                out.write(self.section_fragment(NewsCategory(section_name)))
+        
+        with self.profiler.stage('render_html', magazine['total_articles']):
+            self.html_renderer.render_page(out, magazine['title'], magazine['date'],
+                                           magazine['total_articles'], write_sections)
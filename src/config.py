@@ -60,8 +60,60 @@ SENTIMENT_KEYWORDS = {
 SIMILARITY_THRESHOLD = 0.7
 DUPLICATE_TITLE_THRESHOLD = 0.8
 
+# MinHash/LSH candidate generation for duplicate detection
+LSH_NUM_PERMUTATIONS = 96
+LSH_BANDS = 24  # 4 rows per band, ~0.45 Jaccard threshold
+LSH_SHINGLE_SIZE = 4
+LSH_CONTENT_PREFIX = 200  # Same content window as calculate_similarity
+LSH_MIN_BATCH_SIZE = 500  # Below this, brute-force comparison is cheaper
+STREAM_DEDUP_WINDOW = 10000  # Recent articles remembered when deduplicating a stream
+DEDUP_TIME_WINDOW_HOURS = 24  # Publication time span compared by windowed dedup
+
+# TF-IDF cosine duplicate detection (method='tfidf')
+TFIDF_FEATURES = 4096  # Hashed dimensions
+# Cosine bound for dedup_method='tfidf' only; not comparable to SIMILARITY_THRESHOLD,
+# which bounds calculate_similarity's difflib ratio ('auto' never picks tfidf)
+TFIDF_SIMILARITY_THRESHOLD = 0.8
+TFIDF_BLOCK_SIZE = 1024  # Rows per dense block when NumPy is available
+TFIDF_BLOCK_CACHE_BYTES = 256 * 2 ** 20  # Dense column blocks kept between row passes
+TFIDF_TITLE_WEIGHT = 2
+
+# Recency-aware ranking: bonus = weight * 0.5 ** (age / half-life)
+RECENCY_WEIGHT = 2.0
+RECENCY_HALF_LIFE_HOURS = 12
+
+# Cross-run duplicate index
+FINGERPRINT_INDEX_PATH = 'fingerprints.db'
+FINGERPRINT_TTL_HOURS = 72
+
+# On-disk article archive
+ARCHIVE_PATH = 'articles.archive'
+ARCHIVE_RETENTION_DAYS = 90
+
+# Analysis result cache
+ANALYSIS_CACHE_SIZE = 100000  # In-memory entries
+ANALYSIS_CACHE_DISK_ENTRIES = 5000000
+ANALYSIS_CACHE_COMMIT_INTERVAL = 1000  # Disk writes per commit
+
+# Serialized keyword matchers, built with 'python -m main build-matchers' and read
+# only when passed as --matcher-cache; relative paths are under the source directory
+MATCHER_CACHE_PATH = 'matchers.cache'
+
+# Resident pipeline service
+SERVICE_WORKERS = 2
+SERVICE_QUEUE_SIZE = 100  # Queued jobs before submitters wait
+SERVICE_SOCKET_PATH = 'news_service.sock'
+SERVICE_DATA_DIR = 'service_data'  # Job input and output paths must lie inside it
+
 # Processing settings
 SIMULATION_DELAY_RANGE = (0.5, 2.0)  # seconds
+FETCH_MAX_CONCURRENCY = 5
+FETCH_TIMEOUT_SECONDS = 5.0  # Per attempt
+FETCH_RETRIES = 2
+FETCH_BACKOFF_SECONDS = 0.5  # Doubled after each failed attempt
+HTTP_POOL_SIZE = 4  # Idle keep-alive connections kept per host
+HTTP_USER_AGENT = 'news-aggregator/1.0'
+INGEST_CHUNK_SIZE = 10000  # Articles per process_articles call when ingesting feeds
 MAX_SUMMARY_LENGTH = 150
 ARTICLES_PER_SECTION = 5
 
@@ -0,0 +1,275 @@
+"""
+Candidate generation for near-duplicate detection using MinHash and LSH.
+"""
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from models import Article
+from config import (
+    LSH_NUM_PERMUTATIONS, LSH_BANDS, LSH_SHINGLE_SIZE, LSH_CONTENT_PREFIX, STREAM_DEDUP_WINDOW
+)
+
+_MAX_HASH = (1 << 32) - 1
+
+class MinHasher:
+    """Computes MinHash signatures over character shingles of an article.
+
+    Uses one-permutation hashing: each shingle hash is routed to one of
+    num_permutations bins and the minimum per bin forms the signature, so the
+    cost is linear in the number of shingles rather than shingles times
+    permutations. Empty bins are filled by rotation densification, borrowing
+    the next non-empty bin's value plus a distance offset.
+    """
+
+    def __init__(self, num_permutations: int = LSH_NUM_PERMUTATIONS,
+                 shingle_size: int = LSH_SHINGLE_SIZE,
+                 content_prefix: int = LSH_CONTENT_PREFIX):
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        self.content_prefix = content_prefix
+        self._rotation_offset = _MAX_HASH // num_permutations + 1
+
+    def _hash_shingles(self, prefix: bytes, text: str) -> Set[int]:
+        # crc32 keeps signatures stable across processes and runs
+        encoded = text.encode('utf-8')
+        size = self.shingle_size
+        if len(encoded) <= size:
+            return {zlib.crc32(prefix + encoded)}
+        return {zlib.crc32(prefix + encoded[start:start + size])
+                for start in range(len(encoded) - size + 1)}
+
+    def title_shingles(self, article: Article) -> Set[int]:
+        """Hash the title shingles of an article."""
+        return self._hash_shingles(b't', article.title.lower())
+
+    def content_shingles(self, article: Article) -> Set[int]:
+        """Hash the shingles of the compared content prefix of an article."""
+        return self._hash_shingles(b'c', article.content[:self.content_prefix].lower())
+
+    def shingles(self, article: Article) -> Set[int]:
+        """Hash the title and content-prefix shingles of an article.
+
+        Title and content shingles are kept in separate spaces, mirroring
+        calculate_similarity which compares the two fields independently.
+        """
+        return self.title_shingles(article) | self.content_shingles(article)
+
+    def signature(self, hashes: Set[int]) -> List[int]:
+        """Return the MinHash signature of a set of shingle hashes."""
+        bins = self.num_permutations
+        signature = [None] * bins
+        for value in hashes:
+            index, rank = value % bins, value // bins
+            current = signature[index]
+            if current is None or rank < current:
+                signature[index] = rank
+
+        if all(rank is None for rank in signature):
+            return [_MAX_HASH] * bins
+        if None not in signature:
+            return signature
+
+        # Rotation densification: borrow from the next originally filled bin
+        # to the right (wrapping), so identical sets still get identical signatures
+        original = list(signature)
+        for index in range(bins):
+            if original[index] is not None:
+                continue
+            distance = 1
+            while original[(index + distance) % bins] is None:
+                distance += 1
+            signature[index] = original[(index + distance) % bins] + distance * self._rotation_offset
+        return signature
+
+class LSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures."""
+
+    def __init__(self, hasher: MinHasher = None, bands: int = LSH_BANDS):
+        self.hasher = hasher or MinHasher()
+        if self.hasher.num_permutations % bands:
+            raise ValueError(f"{self.hasher.num_permutations} permutations cannot be split into {bands} bands")
+        self.bands = bands
+        self.rows = self.hasher.num_permutations // bands
+
+    def band_keys(self, article: Article) -> List[tuple]:
+        """Return the bucket keys of an article.
+
+        Articles are banded twice: on title plus content prefix, and on the
+        title alone. A pair can only reach SIMILARITY_THRESHOLD with a title
+        ratio of at least 0.57 (titles weigh 0.7), so the title-only bands
+        keep recall for rewrites that share a headline but little content.
+        """
+        title_hashes = self.hasher.title_shingles(article)
+        full_hashes = title_hashes | self.hasher.content_shingles(article)
+
+        keys = []
+        rows = self.rows
+        for space, hashes in (('full', full_hashes), ('title', title_hashes)):
+            signature = self.hasher.signature(hashes)
+            for band in range(self.bands):
+                keys.append((space, band, tuple(signature[band * rows:(band + 1) * rows])))
+        return keys
+
+    def candidate_pairs(self, articles: List[Article]) -> Dict[int, List[int]]:
+        """Map each article index to the later indices sharing at least one band bucket."""
+        buckets = defaultdict(list)
+
+        for index, article in enumerate(articles):
+            for key in self.band_keys(article):
+                buckets[key].append(index)
+
+        candidates = defaultdict(set)
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for position, first in enumerate(members):
+                candidates[first].update(members[position + 1:])
+
+        return {index: sorted(later) for index, later in candidates.items()}
+
+class TimeWindowIndex:
+    """Articles of a batch sorted by publication time, for windowed comparisons."""
+
+    def __init__(self, articles: List[Article], window: timedelta):
+        self.window_seconds = window.total_seconds()
+        self._timestamps = [article.publication_date.timestamp() for article in articles]
+        self._order = sorted(range(len(articles)), key=self._timestamps.__getitem__)
+        self._sorted_timestamps = [self._timestamps[i] for i in self._order]
+
+    def within_window(self, i: int, j: int) -> bool:
+        return abs(self._timestamps[i] - self._timestamps[j]) <= self.window_seconds
+
+    def later_neighbours(self, i: int) -> List[int]:
+        """Indices after i of articles published within the window of article i."""
+        timestamp = self._timestamps[i]
+        low = bisect_left(self._sorted_timestamps, timestamp - self.window_seconds)
+        high = bisect_right(self._sorted_timestamps, timestamp + self.window_seconds)
+        return sorted(j for j in self._order[low:high] if j > i)
+
+    def restrict(self, candidates: Iterable[int], i: int) -> List[int]:
+        """Keep the candidates of article i published within its window."""
+        return [j for j in candidates if self.within_window(i, j)]
+
+class DisjointSet:
+    """Union-find over indices 0..size-1 with union by size and path halving.
+
+    When two sets of equal size merge, the smaller root index becomes the
+    root, so the resulting partition and roots do not depend on union order.
+    """
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, index: int) -> int:
+        parent = self._parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def union(self, first: int, second: int) -> bool:
+        """Merge the sets of two indices; return False if they were already joined."""
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if (self._size[first], -first) < (self._size[second], -second):
+            first, second = second, first
+        self._parent[second] = first
+        self._size[first] += self._size[second]
+        return True
+
+    def groups(self) -> List[List[int]]:
+        """Sets with more than one member, each sorted, ordered by smallest member."""
+        members = defaultdict(list)
+        for index in range(len(self._parent)):
+            if self._size[self.find(index)] > 1:
+                members[self.find(index)].append(index)
+        return sorted(members.values())
+
+def representative_key(article: Article) -> tuple:
+    """Ordering used to pick the article kept from a duplicate cluster; largest wins."""
+    return (article.relevance_score, article.publication_date, article.title, article.source, article.url)
+
+class DuplicateCluster:
+    """Articles reporting the same story, with the one to keep."""
+
+    __slots__ = ('articles', 'representative')
+
+    def __init__(self, articles: List[Article]):
+        self.articles = articles
+        self.representative = max(articles, key=representative_key)
+
+    @property
+    def size(self) -> int:
+        return len(self.articles)
+
+    @property
+    def duplicates(self) -> List[Article]:
+        """Members other than the representative."""
+        return [article for article in self.articles if article is not self.representative]
+
+class StreamingDeduplicator:
+    """Drops near-duplicates from an unbounded stream using a bounded window.
+
+    Only the most recent window_size kept articles are remembered, bucketed
+    by their LSH band keys; an incoming article is compared exactly against
+    remembered articles sharing a bucket. The first article of a story wins,
+    since later, higher-scoring copies cannot retract one already emitted.
+
+    With a time_window, articles are only compared with remembered articles
+    published within that span, and remembered articles older than the
+    window before the newest arrival are forgotten early.
+    """
+
+    def __init__(self, is_similar: Callable[[Article, Article], bool],
+                 window_size: int = STREAM_DEDUP_WINDOW, index: LSHIndex = None,
+                 time_window: timedelta = None):
+        self.is_similar = is_similar
+        self.window_size = window_size
+        self.time_window = time_window
+        self.index = index or LSHIndex()
+        self._window = deque()
+        self._buckets: Dict[tuple, List[Article]] = defaultdict(list)
+
+    def find_duplicate(self, article: Article) -> Optional[Article]:
+        """Return a remembered article this one duplicates, or None and remember it."""
+        keys = self.index.band_keys(article)
+        time_window = self.time_window
+        seen = set()
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if id(candidate) in seen:
+                    continue
+                seen.add(id(candidate))
+                if time_window is not None and \
+                        abs(candidate.publication_date - article.publication_date) > time_window:
+                    continue
+                if self.is_similar(candidate, article):
+                    return candidate
+
+        self._remember(article, keys)
+        return None
+
+    def _remember(self, article: Article, keys: List[tuple]) -> None:
+        self._window.append((article, keys))
+        for key in keys:
+            self._buckets[key].append(article)
+
+        if len(self._window) > self.window_size:
+            self._forget_oldest()
+        if self.time_window is not None:
+            # Streams are roughly chronological; stop at the first recent article
+            cutoff = article.publication_date - self.time_window
+            while self._window and self._window[0][0].publication_date < cutoff:
+                self._forget_oldest()
+
+    def _forget_oldest(self) -> None:
+        expired, expired_keys = self._window.popleft()
+        for key in expired_keys:
+            bucket = self._buckets[key]
+            bucket.remove(expired)
+            if not bucket:
+                del self._buckets[key]
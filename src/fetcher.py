@@ -0,0 +1,125 @@
+"""
+Concurrent article fetching from news sources.
+"""
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from models import Article, NewsSource
+from config import FETCH_MAX_CONCURRENCY, FETCH_TIMEOUT_SECONDS, FETCH_RETRIES, FETCH_BACKOFF_SECONDS
+from utils import simulate_api_fetch_async
+
+logger = logging.getLogger(__name__)
+
+class ArticleFetcher(ABC):
+    """Fetches the current articles of a single news source.
+
+    Implementations may define fetch as a coroutine, or as a plain blocking
+    function which the engine runs in a worker thread. A blocking fetch that
+    times out is abandoned, but keeps its thread until it returns, so
+    fetchers that record what they have returned derive from StatefulFetcher.
+    """
+
+    @abstractmethod
+    def fetch(self, source: NewsSource) -> List[Article]:
+        """Return the articles currently available from a source."""
+
+class StatefulFetcher(ArticleFetcher):
+    """A blocking fetcher that remembers what it has already returned.
+
+    fetch_pending returns a source's new articles together with the state
+    that marks them as seen, without saving it. FetchEngine calls commit
+    only after it has accepted the articles, so a fetch abandoned on timeout
+    leaves the state alone and the retry returns the same articles.
+    """
+
+    @abstractmethod
+    def fetch_pending(self, source: NewsSource) -> Tuple[List[Article], Optional[Dict]]:
+        """Return the new articles of a source and the state to commit for them, if any."""
+
+    @abstractmethod
+    def commit(self, source: NewsSource, state: Dict) -> None:
+        """Save the state returned by fetch_pending."""
+
+    def fetch(self, source: NewsSource) -> List[Article]:
+        articles, state = self.fetch_pending(source)
+        if state is not None:
+            self.commit(source, state)
+        return articles
+
+class SimulatedFetcher(ArticleFetcher):
+    """In-process fake source serving preloaded articles with simulated API delays."""
+
+    def __init__(self, articles: List[Article], simulate_delay: bool = True):
+        self.simulate_delay = simulate_delay
+        self.articles_by_source: Dict[str, List[Article]] = defaultdict(list)
+        for article in articles:
+            self.articles_by_source[article.source].append(article)
+
+    async def fetch(self, source: NewsSource) -> List[Article]:
+        articles = self.articles_by_source.get(source.name, [])
+        if self.simulate_delay:
+            await simulate_api_fetch_async(source.name, len(articles))
+        return list(articles)
+
+class FetchEngine:
+    """Fetches all sources concurrently with bounded concurrency, timeouts and retries."""
+
+    def __init__(self, fetcher: ArticleFetcher,
+                 max_concurrency: int = FETCH_MAX_CONCURRENCY,
+                 timeout: float = FETCH_TIMEOUT_SECONDS,
+                 retries: int = FETCH_RETRIES,
+                 backoff: float = FETCH_BACKOFF_SECONDS):
+        self.fetcher = fetcher
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def fetch_all(self, sources: List[NewsSource]) -> List[Article]:
+        """Fetch every source and return their articles in source order."""
+        return asyncio.run(self.fetch_all_async(sources))
+
+    async def fetch_all_async(self, sources: List[NewsSource]) -> List[Article]:
+        """Coroutine form of fetch_all for callers already inside an event loop."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(*(self._fetch_source(source, semaphore) for source in sources))
+
+        all_articles = []
+        for source_articles in results:
+            all_articles.extend(source_articles)
+        return all_articles
+
+    async def _fetch_source(self, source: NewsSource, semaphore: asyncio.Semaphore) -> List[Article]:
+        async with semaphore:
+            delay = self.backoff
+            for attempt in range(self.retries + 1):
+                start = time.perf_counter()
+                try:
+                    articles, state = await asyncio.wait_for(self._call_fetcher(source), self.timeout)
+                    if state is not None:
+                        self.fetcher.commit(source, state)
+                except Exception as e:
+                    error = 'timed out' if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__
+                    source.record_fetch(time.perf_counter() - start, error)
+                    logger.warning(f"Fetch from {source.name} failed (attempt {attempt + 1}): {error}")
+                    if attempt < self.retries:
+                        await asyncio.sleep(delay)
+                        delay *= 2
+                    continue
+
+                source.record_fetch(time.perf_counter() - start)
+                source.articles_fetched = len(articles)
+                return articles
+
+        logger.error(f"Giving up on {source.name} after {self.retries + 1} attempts")
+        return []
+
+    async def _call_fetcher(self, source: NewsSource) -> Tuple[List[Article], Optional[Dict]]:
+        if isinstance(self.fetcher, StatefulFetcher):
+            return await asyncio.to_thread(self.fetcher.fetch_pending, source)
+        if asyncio.iscoroutinefunction(self.fetcher.fetch):
+            return await self.fetcher.fetch(source), None
+        return await asyncio.to_thread(self.fetcher.fetch, source), None
@@ -1,74 +1,79 @@
 """
 News filtering and processing engine.
 """
-import re
+import heapq
 import logging
-from typing import List, Dict, Set
+from collections.abc import Sized
+from datetime import timedelta
 from difflib import SequenceMatcher
-from models import Article, Sentiment, NewsCategory
-from config import CATEGORY_KEYWORDS, KEYWORD_WEIGHTS, SENTIMENT_KEYWORDS, SIMILARITY_THRESHOLD
+from typing import Iterable, Iterator, List, Dict, Set, Union
+from models import Article, ArticleBatch, Sentiment, NewsCategory
+from config import SIMILARITY_THRESHOLD, LSH_MIN_BATCH_SIZE, STREAM_DEDUP_WINDOW
+from dedup import DisjointSet, DuplicateCluster, LSHIndex, StreamingDeduplicator, TimeWindowIndex
+from fingerprints import FingerprintIndex
+from search_index import InvertedIndex, iter_matching, parse_query
+from analysis_cache import AnalysisCache, analysis_key
+from profiling import PipelineProfiler, Profiled
+from ranking import RecencyDecay
+from matching import AnalyzedText, RelevanceScorer, SentimentLexicon, load_compiled
 
 logger = logging.getLogger(__name__)
 
-class NewsFilter:
+class NewsFilter(Profiled):
     """Handles filtering and processing of news articles."""
     
-    def __init__(self):
+    def __init__(self, fingerprint_index: FingerprintIndex = None,
+                 analysis_cache: AnalysisCache = None,
+                 profiler: PipelineProfiler = None,
+                 dedup_window: timedelta = None,
+                 recency: RecencyDecay = None,
+                 dedup_method: str = 'auto',
+                 search_index: InvertedIndex = None,
+                 matcher_cache: str = None,
+                 scoring_pool=None):
         self.processed_articles: List[Article] = []
         self.duplicate_groups: List[List[Article]] = []
+        self.duplicate_clusters: List[DuplicateCluster] = []
+        # Matchers come from a serialized build only when the caller names one
+        if matcher_cache is not None:
+            self.relevance_scorer, self.sentiment_lexicon = load_compiled(matcher_cache)
+        else:
+            self.relevance_scorer, self.sentiment_lexicon = RelevanceScorer(), SentimentLexicon()
+        self.fingerprint_index = fingerprint_index
+        # Optional long-lived index for repeated queries; the caller evicts from it
+        self.search_index = search_index
+        # Optional parallel.create_scoring_pool executor reused by workers > 1 runs
+        self.scoring_pool = scoring_pool
+        self.analysis_cache = analysis_cache
+        # Only articles published this close together are compared as duplicates
+        self.dedup_window = dedup_window
+        self.dedup_method = dedup_method
+        # Optional freshness bonus applied when ranking processed articles
+        self.recency = recency
+        if profiler is not None:
+            self.profiler = profiler
     
-    def calculate_relevance_score(self, article: Article) -> float:
+    def calculate_relevance_score(self, article: Article, analyzed: AnalyzedText = None) -> float:
         """Calculate relevance score based on keyword frequency and importance."""
-        score = 0.0
-        text_content = f"{article.title} {article.content}".lower()
-        
-        # Get category-specific keywords
-        category_keywords = CATEGORY_KEYWORDS.get(article.category, {})
-        
-        # Score based on keyword matches
-        for priority, keywords in category_keywords.items():
-            weight = KEYWORD_WEIGHTS.get(priority, 1.0)
-            for keyword in keywords:
-                # Count occurrences of keyword
-                matches = len(re.findall(rf'\b{re.escape(keyword.lower())}\b', text_content))
-                score += matches * weight
-        
-        # Bonus for title keywords
-        title_lower = article.title.lower()
-        for priority, keywords in category_keywords.items():
-            weight = KEYWORD_WEIGHTS.get(priority, 1.0)
-            for keyword in keywords:
-                if keyword.lower() in title_lower:
-                    score += weight * 1.5  # Title keywords are more important
-        
-        # Normalize score by content length
-        if len(article.content) > 0:
-            score = score / (len(article.content) / 100)  # Normalize per 100 characters
-        
-        return round(score, 2)
-    
-    def analyze_sentiment(self, article: Article) -> Sentiment:
+        return self.relevance_scorer.score(article, analyzed)
+    
+    def analyze_sentiment(self, article: Article, analyzed: AnalyzedText = None) -> Sentiment:
         """Analyze sentiment of the article content."""
-        text_content = f"{article.title} {article.content}".lower()
-        
-        positive_score = 0
-        negative_score = 0
-        
-        # Count positive keywords
-        for keyword in SENTIMENT_KEYWORDS['positive']:
-            positive_score += len(re.findall(rf'\b{re.escape(keyword.lower())}\b', text_content))
-        
-        # Count negative keywords
-        for keyword in SENTIMENT_KEYWORDS['negative']:
-            negative_score += len(re.findall(rf'\b{re.escape(keyword.lower())}\b', text_content))
-        
-        # Determine sentiment
-        if positive_score > negative_score:
-            return Sentiment.POSITIVE
-        elif negative_score > positive_score:
-            return Sentiment.NEGATIVE
-        else:
-            return Sentiment.NEUTRAL
+        if analyzed is None:
+            analyzed = AnalyzedText.from_article(article)
+        return self.sentiment_lexicon.classify(analyzed)
+    
+    @property
+    def analysis_version(self) -> str:
+        """Version of the keyword config that scores and sentiment depend on."""
+        return f"{self.relevance_scorer.version}:{self.sentiment_lexicon.version}"
+    
+    def _analysis_key(self, article: Article) -> bytes:
+        return analysis_key(article.title, article.content, article.category, self.analysis_version)
+    
+    def update_sentiment_keywords(self, sentiment_keywords: Dict[str, List[str]]) -> None:
+        """Replace the sentiment lexicon without recreating the filter."""
+        self.sentiment_lexicon.update(sentiment_keywords)
     
     def calculate_similarity(self, article1: Article, article2: Article) -> float:
         """Calculate similarity between two articles."""
@@ -85,125 +90,393 @@ class NewsFilter:
         
         return similarity
     
-    def detect_duplicates(self, articles: List[Article]) -> List[List[Article]]:
-        """Detect duplicate articles based on similarity."""
-        duplicate_groups = []
-        processed_indices = set()
+    def detect_duplicates(self, articles: List[Article], method: str = 'auto',
+                          window: timedelta = None) -> List[List[Article]]:
+        """Detect duplicate articles based on similarity.
+        
+        method is 'exact' (compare every pair), 'lsh' (compare only MinHash/LSH
+        candidate pairs), 'auto' (LSH once the batch reaches LSH_MIN_BATCH_SIZE)
+        or 'tfidf', which groups by cosine similarity of TF-IDF vectors of the
+        whole article, computed for the batch at once, instead of
+        calculate_similarity. With a window (default: the filter's dedup_window), only articles
+        published within that time of each other are compared.
+        """
+        if method == 'auto':
+            method = 'lsh' if len(articles) >= LSH_MIN_BATCH_SIZE else 'exact'
+        
+        window = window if window is not None else self.dedup_window
+        time_index = TimeWindowIndex(articles, window) if window is not None else None
+        
+        if method == 'lsh':
+            with self.profiler.stage('lsh_candidates', len(articles)):
+                candidates = LSHIndex().candidate_pairs(articles)
+            self.profiler.count('lsh_candidate_pairs', sum(len(later) for later in candidates.values()))
+            if time_index is not None:
+                return self._group_duplicates(articles, lambda i: time_index.restrict(candidates.get(i, ()), i))
+            return self._group_duplicates(articles, lambda i: candidates.get(i, ()))
+        elif method == 'tfidf':
+            # Opt-in, and importing similarity loads NumPy (~200ms); other methods skip it
+            from similarity import TfidfSimilarity
+            with self.profiler.stage('tfidf_similarity', len(articles)):
+                similar = TfidfSimilarity().similar_pairs(articles)
+            if time_index is not None:
+                similar = {i: time_index.restrict(later, i) for i, later in similar.items()}
+            return self._group_duplicates(articles, lambda i: similar.get(i, ()), verified=True)
+        elif method == 'exact':
+            if time_index is not None:
+                return self._group_duplicates(articles, time_index.later_neighbours)
+            return self._group_duplicates(articles, lambda i: range(i + 1, len(articles)))
+        else:
+            raise ValueError(f"Unknown duplicate detection method: {method}")
+    
+    def _group_duplicates(self, articles: List[Article], candidates,
+                          verified: bool = False) -> List[List[Article]]:
+        """Cluster articles connected by candidate pairs above the similarity threshold.
+        
+        Clusters are the connected components of the duplicate edges, built
+        with a disjoint set, so they are transitive and do not depend on
+        which article is seen first. Pairs already in one cluster are not
+        compared. With verified, candidates are already known duplicates.
+        Clusters are ordered by, and list members in, input order.
+        """
+        clusters = DisjointSet(len(articles))
+        comparisons = 0
         
         for i, article1 in enumerate(articles):
-            if i in processed_indices:
-                continue
+            for j in candidates(i):
+                if clusters.find(i) == clusters.find(j):
+                    continue
                 
-            duplicate_group = [article1]
-            processed_indices.add(i)
-            
-            for j, article2 in enumerate(articles[i+1:], i+1):
-                if j in processed_indices:
+                if verified:
+                    clusters.union(i, j)
                     continue
-                    
-                similarity = self.calculate_similarity(article1, article2)
-                if similarity >= SIMILARITY_THRESHOLD:
-                    duplicate_group.append(article2)
-                    processed_indices.add(j)
-            
-            if len(duplicate_group) > 1:
-                duplicate_groups.append(duplicate_group)
+                
+                comparisons += 1
+                if self._symmetric_similarity(article1, articles[j]) >= SIMILARITY_THRESHOLD:
+                    clusters.union(i, j)
         
-        return duplicate_groups
+        self.profiler.count('pairwise_comparisons', comparisons)
+        return [[articles[index] for index in group] for group in clusters.groups()]
+    
+    def _symmetric_similarity(self, article1: Article, article2: Article) -> float:
+        # SequenceMatcher is not symmetric; compare in an order-independent orientation
+        first, second = sorted((article1, article2), key=_orientation_key)
+        return self.calculate_similarity(first, second)
     
     def remove_duplicates(self, articles: List[Article]) -> List[Article]:
         """Remove duplicate articles, keeping the highest scoring one from each group."""
-        duplicate_groups = self.detect_duplicates(articles)
-        self.duplicate_groups = duplicate_groups
+        buckets: Dict[int, List[int]] = {}
+        articles = self._drop_published(articles, buckets)
+        return self._remove_duplicates(articles, buckets)
+    
+    def _drop_published(self, articles: List[Article], buckets: Dict[int, List[int]]) -> List[Article]:
+        """Drop stories already published by earlier runs, keeping the LSH buckets computed."""
+        if self.fingerprint_index is None:
+            return articles
+        self.fingerprint_index.evict_expired()
+        return self.fingerprint_index.filter_unseen(articles, self._symmetric_similarity, buckets)
+    
+    def _remove_duplicates(self, articles: List[Article], buckets: Dict[int, List[int]]) -> List[Article]:
+        clusters = [DuplicateCluster(group) for group in self.detect_duplicates(articles, self.dedup_method)]
+        self.duplicate_clusters = clusters
+        # Representative first, as callers of duplicate_groups expect
+        self.duplicate_groups = [[cluster.representative] + cluster.duplicates for cluster in clusters]
         
-        # Create set of articles to remove
+        # Keep the representative (highest scoring) article of each cluster
         articles_to_remove = set()
-        for group in duplicate_groups:
-            # Sort by relevance score and keep the highest
-            group.sort(key=lambda x: x.relevance_score, reverse=True)
-            best_article = group[0]
-            
-            # Mark others for removal
-            for article in group[1:]:
+        for cluster in clusters:
+            best_article = cluster.representative
+            for article in cluster.duplicates:
                 articles_to_remove.add(id(article))
                 logger.info(f"Removing duplicate article: '{article.title}' (similar to '{best_article.title}')")
         
+        if clusters:
+            logger.info(f"Found {len(clusters)} duplicate clusters; largest has "
+                        f"{max(cluster.size for cluster in clusters)} articles")
+        
         # Return filtered list
         filtered_articles = [article for article in articles if id(article) not in articles_to_remove]
+        
+        # Removed duplicates are recorded too, so later rewrites of any of them are caught
+        if self.fingerprint_index is not None:
+            self.fingerprint_index.add(articles, buckets)
+        
         return filtered_articles
     
-    def filter_by_keywords(self, articles: List[Article], keywords: List[str]) -> List[Article]:
-        """Filter articles that contain specific keywords."""
-        if not keywords:
-            return articles
+    def iter_by_keywords(self, articles: Iterable[Article], keywords: Union[List[str], str]) -> Iterator[Article]:
+        """Lazily yield articles matching any of the keywords, or a boolean query string.
         
-        filtered_articles = []
-        keywords_lower = [kw.lower() for kw in keywords]
+        Keywords match whole tokens (or token phrases) of the title and content.
+        """
+        return iter_matching(articles, keywords)
+    
+    def search_keywords(self, articles: Iterable[Article], query: Union[List[str], str]) -> Iterator[Article]:
+        """Yield articles matching a query, through the filter's search_index if it has one.
         
+        A search_index keeps articles indexed across calls, so repeated queries
+        over the same corpus only pay for posting-list lookups; the owner of
+        that index drops stale articles with InvertedIndex.remove. Without one,
+        a single token scan is cheaper than building an index for one query.
+        """
+        if self.search_index is None:
+            return self.iter_by_keywords(articles, query)
+        
+        index = self.search_index
+        articles = list(articles)
         for article in articles:
-            text_content = f"{article.title} {article.content}".lower()
-            
-            # Check if any keyword is present
-            for keyword in keywords_lower:
-                if keyword in text_content:
-                    filtered_articles.append(article)
-                    break
+            index.add(article)
         
-        return filtered_articles
+        matching = parse_query(query).evaluate(index)
+        return (article for article in articles if index.document_id(article) in matching)
+    
+    def iter_by_category(self, articles: Iterable[Article], categories: List[NewsCategory]) -> Iterator[Article]:
+        """Lazily yield articles in any of the categories."""
+        categories = set(categories)
+        return (article for article in articles if article.category in categories)
+    
+    def iter_by_source(self, articles: Iterable[Article], sources: List[str]) -> Iterator[Article]:
+        """Lazily yield articles from any of the sources."""
+        sources = set(sources)
+        return (article for article in articles if article.source in sources)
+    
+    def filter_by_keywords(self, articles: List[Article], keywords: Union[List[str], str]) -> List[Article]:
+        """Filter articles that contain specific keywords or match a boolean query."""
+        if not keywords:
+            return articles
+        
+        return list(self.search_keywords(articles, keywords))
     
     def filter_by_category(self, articles: List[Article], categories: List[NewsCategory]) -> List[Article]:
         """Filter articles by category."""
         if not categories:
             return articles
         
-        return [article for article in articles if article.category in categories]
+        return list(self.iter_by_category(articles, categories))
     
     def filter_by_source(self, articles: List[Article], sources: List[str]) -> List[Article]:
         """Filter articles by news source."""
         if not sources:
             return articles
         
-        return [article for article in articles if article.source in sources]
+        return list(self.iter_by_source(articles, sources))
+    
+    def _filter_stages(self, articles: Iterable[Article],
+                       keyword_filter: Union[List[str], str] = None,
+                       category_filter: List[NewsCategory] = None,
+                       source_filter: List[str] = None,
+                       stage_counts: Dict[str, int] = None,
+                       indexed: bool = False) -> Iterator[Article]:
+        """Chain the requested filters as lazy stages, optionally counting each stage's output."""
+        stages = [
+            ('keyword', keyword_filter, self.search_keywords if indexed else self.iter_by_keywords),
+            ('category', category_filter, self.iter_by_category),
+            ('source', source_filter, self.iter_by_source),
+        ]
+        
+        stream = iter(articles)
+        for name, criteria, stage in stages:
+            if criteria:
+                stream = stage(stream, criteria)
+                if stage_counts is not None:
+                    stream = _counted(stream, stage_counts, name)
+        return stream
+    
+    def score_article(self, article: Article) -> Article:
+        """Set the relevance score and sentiment of an article."""
+        key = None
+        if self.analysis_cache is not None:
+            key = self._analysis_key(article)
+            cached = self.analysis_cache.get(key)
+            if cached is not None:
+                article.relevance_score, article.sentiment = cached
+                article.processed = True
+                return article
+        
+        # Lowercase and tokenize once for both scoring passes
+        analyzed = AnalyzedText.from_article(article)
+        article.relevance_score = self.calculate_relevance_score(article, analyzed)
+        article.sentiment = self.analyze_sentiment(article, analyzed)
+        article.processed = True
+        
+        if key is not None:
+            self.analysis_cache.put(key, article.relevance_score, article.sentiment)
+        return article
+    
+    def score_batch(self, batch: ArticleBatch) -> ArticleBatch:
+        """Score every row of a columnar batch in place, without creating Article objects."""
+        for index in range(len(batch)):
+            analyzed = AnalyzedText(batch.title(index), batch.content(index))
+            batch.scores[index] = self.relevance_scorer.score_analyzed(analyzed, batch.category(index))
+            batch.set_sentiment(index, self.sentiment_lexicon.classify(analyzed))
+            batch.processed[index] = True
+        return batch
+    
+    def filter_batch(self, batch: ArticleBatch, category_filter: List[NewsCategory] = None,
+                     source_filter: List[str] = None) -> ArticleBatch:
+        """Category and source filtering of a columnar batch, without creating Article objects."""
+        if not category_filter and not source_filter:
+            return batch
+        return batch.take(batch.rows_matching(category_filter or None, source_filter or None))
+    
+    def iter_scored(self, articles: Iterable[Article]) -> Iterator[Article]:
+        """Lazily score each article of a stream."""
+        return (self.score_article(article) for article in articles)
+    
+    def iter_unique(self, articles: Iterable[Article],
+                    window_size: int = STREAM_DEDUP_WINDOW) -> Iterator[Article]:
+        """Lazily drop near-duplicates of recently seen articles.
+        
+        Memory is bounded by window_size; the first copy of a story is kept.
+        """
+        deduplicator = StreamingDeduplicator(
+            lambda seen, article: self.calculate_similarity(seen, article) >= SIMILARITY_THRESHOLD,
+            window_size, time_window=self.dedup_window
+        )
+        
+        for article in articles:
+            original = deduplicator.find_duplicate(article)
+            if original is None:
+                yield article
+            else:
+                logger.info(f"Removing duplicate article: '{article.title}' (similar to '{original.title}')")
     
-    def process_articles(self, articles: List[Article], 
-                        keyword_filter: List[str] = None,
+    def stream_articles(self, articles: Iterable[Article],
+                        keyword_filter: Union[List[str], str] = None,
                         category_filter: List[NewsCategory] = None,
                         source_filter: List[str] = None,
-                        remove_duplicates: bool = True) -> List[Article]:
-        """Process articles through the complete filtering pipeline."""
-        
-        logger.info(f"Starting processing of {len(articles)} articles")
+                        remove_duplicates: bool = True) -> Iterator[Article]:
+        """Lazily filter, score and deduplicate any iterable of articles.
         
-        # Apply filters
-        filtered_articles = articles.copy()
+        Unlike process_articles, nothing is materialized: articles are yielded
+        as they are scored, in input order. Combine with top_articles for a
+        bounded-memory ranking of an unbounded feed.
+        """
+        stream = self._filter_stages(articles, keyword_filter, category_filter, source_filter)
+        stream = self.iter_scored(stream)
         
-        if keyword_filter:
-            filtered_articles = self.filter_by_keywords(filtered_articles, keyword_filter)
-            logger.info(f"After keyword filtering: {len(filtered_articles)} articles")
+        if remove_duplicates:
+            stream = self.iter_unique(stream)
         
-        if category_filter:
-            filtered_articles = self.filter_by_category(filtered_articles, category_filter)
-            logger.info(f"After category filtering: {len(filtered_articles)} articles")
+        return stream
+    
+    def rank_score(self, article: Article) -> float:
+        """Score articles are ranked by: relevance plus any recency bonus."""
+        if self.recency is None:
+            return article.relevance_score
+        return self.recency.score(article)
+    
+    def top_articles(self, articles: Iterable[Article], limit: int) -> List[Article]:
+        """Return the highest ranked articles of a stream, keeping only limit in memory."""
+        return heapq.nlargest(limit, articles, key=self.rank_score)
+    
+    def _score_in_parallel(self, articles: List[Article], workers: int) -> None:
+        """Score articles across a process pool, sending only cache misses to the workers."""
+        pending = articles
+        keys = {}
+        if self.analysis_cache is not None:
+            pending = []
+            for article in articles:
+                key = self._analysis_key(article)
+                cached = self.analysis_cache.get(key)
+                if cached is None:
+                    keys[id(article)] = key
+                    pending.append(article)
+                else:
+                    article.relevance_score, article.sentiment = cached
+                    article.processed = True
         
-        if source_filter:
-            filtered_articles = self.filter_by_source(filtered_articles, source_filter)
-            logger.info(f"After source filtering: {len(filtered_articles)} articles")
+        if not pending:
+            return
         
-        # Calculate relevance scores and sentiment
-        for article in filtered_articles:
-            article.relevance_score = self.calculate_relevance_score(article)
-            article.sentiment = self.analyze_sentiment(article)
+        # The process pool machinery costs ~10ms to import; single-worker runs skip it
+        from parallel import score_in_parallel
+        results = score_in_parallel(pending, workers, self.relevance_scorer, self.sentiment_lexicon,
+                                    self.scoring_pool)
+        for article, (score, sentiment) in zip(pending, results):
+            article.relevance_score = score
+            article.sentiment = sentiment
             article.processed = True
+            if self.analysis_cache is not None:
+                self.analysis_cache.put(keys[id(article)], score, sentiment)
+    
+    def process_articles(self, articles: Iterable[Article], 
+                        keyword_filter: Union[List[str], str] = None,
+                        category_filter: List[NewsCategory] = None,
+                        source_filter: List[str] = None,
+                        remove_duplicates: bool = True,
+                        workers: int = 1) -> List[Article]:
+        """Process articles through the complete filtering pipeline.
+        
+        keyword_filter is a list of keywords (any must match) or a query string
+        with AND/OR/NOT, parentheses and "quoted phrases", matched by a token
+        scan, or through the filter's search_index if it has one. With
+        workers > 1, relevance and sentiment scoring is sharded across a
+        process pool; results are identical to the serial path.
+        
+        Columnar batches have their own path: filter_batch, score_batch, then
+        MagazineCompiler.compile_magazine; keyword and duplicate filtering
+        need Article objects (batch.iter_articles()).
+        """
+        if isinstance(articles, ArticleBatch):
+            raise TypeError("process_articles takes Article objects; use filter_batch and score_batch "
+                            "for an ArticleBatch, or pass batch.iter_articles()")
+        
+        if isinstance(articles, Sized):
+            logger.info(f"Starting processing of {len(articles)} articles")
+        else:
+            logger.info("Starting processing of article stream")
+        
+        profiler = self.profiler
+        
+        # Apply filters as chained lazy stages, materialized once
+        stage_counts: Dict[str, int] = {}
+        with profiler.stage('filter') as stage:
+            filtered_articles = list(self._filter_stages(
+                articles, keyword_filter, category_filter, source_filter, stage_counts, indexed=True
+            ))
+            stage.items = len(filtered_articles)
+        
+        for name, count in stage_counts.items():
+            logger.info(f"After {name} filtering: {count} articles")
+        
+        # Stories published by earlier runs are dropped before they are scored
+        buckets: Dict[int, List[int]] = {}
+        if remove_duplicates and self.fingerprint_index is not None:
+            with profiler.stage('published', len(filtered_articles)):
+                filtered_articles = self._drop_published(filtered_articles, buckets)
+        
+        # Calculate relevance scores and sentiment (one stage: they share tokenization)
+        with profiler.stage('scoring', len(filtered_articles)):
+            if workers > 1 and filtered_articles:
+                self._score_in_parallel(filtered_articles, workers)
+            else:
+                for article in filtered_articles:
+                    self.score_article(article)
+            
+            if self.analysis_cache is not None:
+                self.analysis_cache.flush()
         
         # Remove duplicates if requested
         if remove_duplicates:
-            filtered_articles = self.remove_duplicates(filtered_articles)
+            with profiler.stage('dedup', len(filtered_articles)):
+                filtered_articles = self._remove_duplicates(filtered_articles, buckets)
             logger.info(f"After duplicate removal: {len(filtered_articles)} articles")
         
-        # Sort by relevance score
-        filtered_articles.sort(key=lambda x: x.relevance_score, reverse=True)
+        # Sort by relevance score, adjusted for recency if configured
+        with profiler.stage('sort', len(filtered_articles)):
+            filtered_articles.sort(key=self.rank_score, reverse=True)
         
         self.processed_articles = filtered_articles
         logger.info("Article processing completed")
         
-        return filtered_articles
\ No newline at end of file
+        return filtered_articles
+
+def _orientation_key(article: Article) -> tuple:
+    return (article.title, article.content, article.source, article.url, article.publication_date)
+
+def _counted(articles: Iterable[Article], counts: Dict[str, int], name: str) -> Iterator[Article]:
+    """Pass articles through while counting them under name."""
+    counts[name] = 0
+    for article in articles:
+        counts[name] += 1
+        yield article
@@ -0,0 +1,173 @@
+"""
+Persistent MinHash/LSH band index for cross-run duplicate detection.
+"""
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from models import Article, NewsCategory
+from dedup import LSHIndex
+from config import FINGERPRINT_INDEX_PATH, FINGERPRINT_TTL_HOURS, SIMILARITY_THRESHOLD, LSH_CONTENT_PREFIX
+
+logger = logging.getLogger(__name__)
+
+def article_key(article: Article) -> str:
+    """Return a stable key for an article: its URL, or a digest of source and title."""
+    if article.url:
+        return article.url
+    digest = hashlib.sha1(f"{article.source}\n{article.title}".encode('utf-8')).hexdigest()
+    return f"sha1:{digest}"
+
+def _bucket(band_key: tuple) -> int:
+    # Band keys become signed 64-bit integers, which SQLite indexes natively
+    return int.from_bytes(hashlib.blake2b(repr(band_key).encode('utf-8'), digest_size=8).digest(),
+                          'big', signed=True)
+
+class FingerprintIndex:
+    """On-disk index of previously published articles, queried with the batch LSH bands.
+
+    Each stored article keeps its title and compared content prefix, plus the
+    bucket of every MinHash band dedup.LSHIndex would put it in. A new article
+    is checked against stored articles sharing a bucket with it, using the
+    same similarity function and SIMILARITY_THRESHOLD as in-batch
+    deduplication, so a rewrite that a batch would merge is also caught
+    across runs.
+    """
+
+    def __init__(self, path: str = FINGERPRINT_INDEX_PATH,
+                 ttl_hours: float = FINGERPRINT_TTL_HOURS,
+                 threshold: float = SIMILARITY_THRESHOLD,
+                 lsh: LSHIndex = None):
+        self.path = path
+        self.ttl = timedelta(hours=ttl_hours)
+        self.threshold = threshold
+        self.lsh = lsh or LSHIndex()
+        import sqlite3  # Loaded on first use so importing filters stays cheap
+        self._connection = sqlite3.connect(path)
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._connection:
+            # Superseded SimHash table of earlier versions
+            self._connection.execute("DROP TABLE IF EXISTS fingerprints")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS published ("
+                "key TEXT PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL, "
+                "source TEXT NOT NULL, url TEXT NOT NULL, category TEXT NOT NULL, "
+                "publication_date REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS published_buckets (bucket INTEGER NOT NULL, key TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS published_buckets_bucket ON published_buckets (bucket)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS published_buckets_key ON published_buckets (key)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS published_date ON published (publication_date)"
+            )
+
+    def buckets(self, article: Article) -> List[int]:
+        """The LSH buckets of an article, as stored in the index."""
+        return [_bucket(band_key) for band_key in self.lsh.band_keys(article)]
+
+    def find_match(self, article: Article,
+                   similarity: Callable[[Article, Article], float]) -> Optional[Tuple[str, str]]:
+        """Return (key, title) of a stored article this one duplicates, if any."""
+        return self._lookup(article, similarity)[0]
+
+    def _lookup(self, article: Article, similarity: Callable[[Article, Article], float],
+                buckets: List[int] = None) -> Tuple[Optional[Tuple[str, str]], Optional[List[int]]]:
+        # Buckets are only computed when the key lookup misses, and returned for reuse
+        key = article_key(article)
+        row = self._connection.execute(
+            "SELECT key, title FROM published WHERE key = ?", (key,)
+        ).fetchone()
+        if row:
+            return row, buckets
+
+        if buckets is None:
+            buckets = self.buckets(article)
+        placeholders = ', '.join('?' * len(buckets))
+        rows = self._connection.execute(
+            f"SELECT key, title, content, source, url, category, publication_date FROM published "
+            f"WHERE key IN (SELECT key FROM published_buckets WHERE bucket IN ({placeholders}))",
+            buckets
+        )
+        for stored_key, title, content, source, url, category, timestamp in rows:
+            stored = Article(title, source, datetime.fromtimestamp(timestamp), content,
+                             NewsCategory(category), [], url)
+            if similarity(article, stored) >= self.threshold:
+                return (stored_key, title), buckets
+        return None, buckets
+
+    def filter_unseen(self, articles: List[Article], similarity: Callable[[Article, Article], float],
+                      buckets: Dict[int, List[int]] = None) -> List[Article]:
+        """Return the articles that duplicate no article already in the index.
+
+        similarity must be symmetric. If a buckets dict is given, the LSH
+        buckets of each unseen article are stored in it under id(article),
+        for a later add() to reuse.
+        """
+        unseen = []
+        for article in articles:
+            match, article_buckets = self._lookup(article, similarity)
+            if match:
+                logger.info(f"Skipping already published article: '{article.title}' (seen as '{match[1]}')")
+            else:
+                unseen.append(article)
+                if buckets is not None:
+                    buckets[id(article)] = article_buckets
+        return unseen
+
+    def add(self, articles: List[Article], buckets: Dict[int, List[int]] = None) -> None:
+        """Record articles as published, reusing buckets from filter_unseen when given."""
+        if not articles:
+            return
+
+        buckets = buckets or {}
+        rows = []
+        bucket_rows = []
+        for article in articles:
+            key = article_key(article)
+            rows.append((key, article.title, article.content[:LSH_CONTENT_PREFIX], article.source,
+                         article.url, article.category.value, article.publication_date.timestamp()))
+            article_buckets = buckets.get(id(article))
+            if article_buckets is None:
+                article_buckets = self.buckets(article)
+            bucket_rows.extend((bucket, key) for bucket in set(article_buckets))
+
+        with self._connection:
+            self._connection.executemany("DELETE FROM published_buckets WHERE key = ?",
+                                         [(row[0],) for row in rows])
+            self._connection.executemany("INSERT OR REPLACE INTO published VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._connection.executemany("INSERT INTO published_buckets VALUES (?, ?)", bucket_rows)
+
+    def evict_expired(self, now: datetime = None) -> int:
+        """Drop articles published more than the TTL ago."""
+        cutoff = ((now or datetime.now()) - self.ttl).timestamp()
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM published_buckets WHERE key IN "
+                "(SELECT key FROM published WHERE publication_date < ?)", (cutoff,)
+            )
+            cursor = self._connection.execute(
+                "DELETE FROM published WHERE publication_date < ?", (cutoff,)
+            )
+        if cursor.rowcount:
+            logger.info(f"Evicted {cursor.rowcount} expired fingerprints")
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM published").fetchone()[0]
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> 'FingerprintIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,264 @@
+"""
+HTTP feed fetching with per-host keep-alive pools and conditional requests.
+"""
+import gzip
+import http.client
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from models import Article, NewsSource
+from fetcher import StatefulFetcher
+from config import FETCH_TIMEOUT_SECONDS, HTTP_POOL_SIZE, HTTP_USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+# Errors from reusing a keep-alive connection the server has already closed
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                            ConnectionResetError, BrokenPipeError)
+
+class HttpStatusError(Exception):
+    """A feed request answered with a status other than 200 or 304."""
+
+    def __init__(self, url: str, status: int, reason: str):
+        super().__init__(f"HTTP {status} {reason} from {url}")
+        self.url = url
+        self.status = status
+
+class HostConnectionPool:
+    """Idle keep-alive connections to one host, reused most recently released first."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int],
+                 max_idle: int = HTTP_POOL_SIZE, timeout: float = FETCH_TIMEOUT_SECONDS):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    def acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return a connection and whether it was reused from the pool."""
+        with self._lock:
+            if self._idle:
+                self.reused += 1
+                return self._idle.pop(), True
+            self.opened += 1
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout), False
+
+    def release(self, connection: http.client.HTTPConnection) -> None:
+        """Keep a connection whose response was fully read for the next request."""
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+class FeedStateStore:
+    """Per-source validators and cursors, persisted as one JSON object.
+
+    Each source maps to {'etag', 'last_modified', 'cursor', 'cursor_date'}:
+    the validators of the last 200 response and the key and publication
+    date of the newest article seen. The file is rewritten atomically after
+    every change; with path None the state lives in memory only.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {}
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self._states = json.load(f)
+
+    def get(self, source_name: str) -> Dict:
+        with self._lock:
+            return dict(self._states.get(source_name, {}))
+
+    def update(self, source_name: str, **values) -> None:
+        with self._lock:
+            self._states.setdefault(source_name, {}).update(values)
+            if self.path is None:
+                return
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump(self._states, f, indent=2, sort_keys=True)
+            os.replace(temporary_path, self.path)
+
+def _article_key(record: Dict) -> str:
+    return record.get('url') or record['title']
+
+class HttpFetcher(StatefulFetcher):
+    """Polls each source's JSON Lines feed over HTTP and returns only new articles.
+
+    Feeds carry one Article.to_dict() record per line, newest first, as
+    FeedReader reads them. Requests are conditional on the ETag and
+    Last-Modified of the previous response, so an unchanged feed costs a
+    304 and no parsing. On a changed feed, parsing stops at the article
+    remembered as the source's cursor, or at the first one older than it.
+
+    Connections are pooled per host and kept alive across polls; fetch is
+    blocking, and FetchEngine runs it in worker threads, saving the new
+    validators and cursor only once it has accepted the articles.
+    """
+
+    def __init__(self, feed_urls: Dict[str, str], state: FeedStateStore,
+                 pool_size: int = HTTP_POOL_SIZE, timeout: float = FETCH_TIMEOUT_SECONDS):
+        self.feed_urls = feed_urls
+        self.state = state
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pools: Dict[Tuple[str, str, Optional[int]], HostConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        # Fetches run concurrently in worker threads
+        self._stats_lock = threading.Lock()
+        self.requests = 0
+        self.not_modified = 0
+        self.bytes_received = 0
+        self.records_parsed = 0
+
+    def __enter__(self) -> 'HttpFetcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _pool(self, scheme: str, host: str, port: Optional[int]) -> HostConnectionPool:
+        key = (scheme, host, port)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = HostConnectionPool(scheme, host, port, self.pool_size, self.timeout)
+            return pool
+
+    def _count(self, requests: int = 0, not_modified: int = 0, bytes_received: int = 0,
+               records_parsed: int = 0) -> None:
+        with self._stats_lock:
+            self.requests += requests
+            self.not_modified += not_modified
+            self.bytes_received += bytes_received
+            self.records_parsed += records_parsed
+
+    def fetch_pending(self, source: NewsSource) -> Tuple[List[Article], Optional[Dict]]:
+        url = self.feed_urls.get(source.name)
+        if url is None:
+            return [], None
+        state = self.state.get(source.name)
+
+        headers = {'User-Agent': HTTP_USER_AGENT, 'Accept-Encoding': 'gzip'}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+
+        status, reason, response_headers, body = self._request(url, headers)
+        if status == 304:
+            self._count(not_modified=1)
+            return [], None
+        if status != 200:
+            raise HttpStatusError(url, status, reason)
+
+        if response_headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(body)
+        articles, newest = self._parse_new(source.name, body, state)
+
+        values = {'etag': response_headers.get('ETag'),
+                  'last_modified': response_headers.get('Last-Modified')}
+        if newest is not None:
+            values['cursor'], values['cursor_date'] = newest
+        return articles, values
+
+    def commit(self, source: NewsSource, state: Dict) -> None:
+        self.state.update(source.name, **state)
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+        parts = urlsplit(url)
+        pool = self._pool(parts.scheme, parts.hostname, parts.port)
+        target = parts.path or '/'
+        if parts.query:
+            target += f"?{parts.query}"
+
+        while True:
+            connection, reused = pool.acquire()
+            try:
+                connection.request('GET', target, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused:
+                    continue  # The server closed an idle connection; retry on a fresh one
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            break
+
+        self._count(requests=1, bytes_received=len(body))
+        if response.will_close:
+            connection.close()
+        else:
+            pool.release(connection)
+        return response.status, response.reason, response.headers, body
+
+    def _parse_new(self, source_name: str, body: bytes, state: Dict) -> Tuple[List[Article], Optional[Tuple[str, float]]]:
+        """Articles newer than the source's cursor, and the (key, timestamp) of the newest one."""
+        cursor = state.get('cursor')
+        cursor_date = state.get('cursor_date')
+        articles = []
+        newest = None
+        parsed = 0
+        for line_number, line in enumerate(body.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                article = Article.from_dict(record)
+                key = _article_key(record)
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed record {line_number} of {source_name}'s feed: {e!r}")
+                continue
+            parsed += 1
+
+            timestamp = article.publication_date.timestamp()
+            if key == cursor or (cursor_date is not None and timestamp < cursor_date):
+                break
+            if newest is None:
+                newest = (key, timestamp)
+            articles.append(article)
+        self._count(records_parsed=parsed)
+        return articles, newest
+
+    def stats(self) -> Dict[str, int]:
+        with self._pools_lock:
+            pools = list(self._pools.values())
+        with self._stats_lock:
+            counts = {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'bytes_received': self.bytes_received,
+                'records_parsed': self.records_parsed
+            }
+        return {
+            **counts,
+            'connections_opened': sum(pool.opened for pool in pools),
+            'connections_reused': sum(pool.reused for pool in pools)
+        }
+
+    def close(self) -> None:
+        with self._pools_lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,111 @@
+"""
+Streaming ingestion of articles from JSON Lines feed dumps.
+"""
+import gzip
+import json
+import logging
+import time
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+from models import Article, ArticleBatch
+from config import INGEST_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b'\x1f\x8b'
+
+def open_feed(path: str) -> BinaryIO:
+    """Open a feed file for binary reading, transparently decompressing gzip."""
+    with open(path, 'rb') as f:
+        compressed = f.read(2) == _GZIP_MAGIC
+    return gzip.open(path, 'rb') if compressed else open(path, 'rb')
+
+class FeedReader:
+    """Incrementally parses articles from JSON Lines (NDJSON) files, gzipped or not.
+
+    Records are parsed one line at a time, so memory use does not depend on
+    feed size. Malformed lines are logged and skipped. After (or during)
+    reading, the counters report parse throughput in MB/s of JSON.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.bytes_read = 0
+        self.articles_read = 0
+        self.errors = 0
+        self.seconds = 0.0
+
+    def __iter__(self) -> Iterator[Article]:
+        for path in self.paths:
+            yield from self._read(path)
+
+    def _read(self, path: str) -> Iterator[Article]:
+        with open_feed(path) as f:
+            started = time.perf_counter()
+            for line_number, line in enumerate(f, 1):
+                self.bytes_read += len(line)
+                if line.isspace():
+                    continue
+                try:
+                    article = Article.from_dict(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    self.errors += 1
+                    logger.warning(f"Skipping malformed record at {path}:{line_number}: {e!r}")
+                    continue
+                self.articles_read += 1
+                # Time spent by the consumer between articles is not parse time
+                self.seconds += time.perf_counter() - started
+                yield article
+                started = time.perf_counter()
+            self.seconds += time.perf_counter() - started
+
+    def iter_chunks(self, chunk_size: int = INGEST_CHUNK_SIZE) -> Iterator[List[Article]]:
+        """Yield lists of up to chunk_size articles."""
+        chunk = []
+        for article in self:
+            chunk.append(article)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def read_batch(self) -> ArticleBatch:
+        """Read every article into compact columnar storage."""
+        return ArticleBatch.from_articles(self)
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / 2 ** 20 / self.seconds if self.seconds > 0 else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'articles': self.articles_read,
+            'errors': self.errors,
+            'bytes': self.bytes_read,
+            'seconds': round(self.seconds, 6),
+            'mb_per_second': round(self.megabytes_per_second, 2)
+        }
+
+def process_feed(paths: Iterable[str], news_filter, chunk_size: int = INGEST_CHUNK_SIZE,
+                 **process_options) -> Iterator[List[Article]]:
+    """Run news_filter.process_articles over a feed one chunk at a time.
+
+    Duplicates are removed within each chunk; give the filter a
+    FingerprintIndex to also drop duplicates of articles in earlier chunks.
+    """
+    reader = FeedReader(paths)
+    for chunk in reader.iter_chunks(chunk_size):
+        yield news_filter.process_articles(chunk, **process_options)
+    logger.info(f"Ingested {reader.articles_read} articles at {reader.megabytes_per_second:.1f} MB/s "
+                f"({reader.errors} malformed records skipped)")
+
+def write_feed(articles: Iterable[Article], path: str) -> int:
+    """Write articles as JSON Lines, gzipped if path ends in .gz; returns the count."""
+    opener = gzip.open if path.endswith('.gz') else open
+    count = 0
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for article in articles:
+            f.write(json.dumps(article.to_dict(), ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    return count
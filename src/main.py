@@ -1,17 +1,35 @@
 """
 Main application entry point for the news aggregation system.
 """
+import argparse
+import json
+import logging
+import os
+import sys
 import time
-from typing import List
+from datetime import timedelta
+from typing import Dict, List, Tuple
 from models import Article, NewsCategory
+from config import (
+    RECENCY_HALF_LIFE_HOURS, SERVICE_SOCKET_PATH, SERVICE_WORKERS, SERVICE_QUEUE_SIZE, SERVICE_DATA_DIR,
+    MATCHER_CACHE_PATH, DEDUP_TIME_WINDOW_HOURS
+)
 from data import generate_sample_articles, get_news_sources
 from filters import NewsFilter
 from compiler import MagazineCompiler
+from analysis_cache import AnalysisCache
+from matching import matcher_cache_path, save_compiled
+from ingest import FeedReader
+from profiling import PipelineProfiler
+from ranking import RecencyDecay
 from utils import (
-    simulate_api_fetch, setup_logging, print_processing_step,
-    print_statistics, print_banner, save_to_file
+    setup_logging, print_processing_step,
+    print_statistics, print_banner, stream_to_file
 )
 
+# Shared by the demonstrations, which rescore the same sample articles
+analysis_cache = AnalysisCache()
+
 def simulate_data_collection() -> List[Article]:
     """Simulate collecting articles from various news sources."""
     print_processing_step("SIMULATING DATA COLLECTION", "Fetching from 10 news sources...")
@@ -19,23 +37,11 @@ def simulate_data_collection() -> List[Article]:
     articles = generate_sample_articles()
     sources = get_news_sources()
     
-    # Group articles by source for realistic simulation
-    articles_by_source = {}
-    for article in articles:
-        if article.source not in articles_by_source:
-            articles_by_source[article.source] = []
-        articles_by_source[article.source].append(article)
-    
-    # Simulate fetching from each source
-    all_articles = []
-    for source in sources:
-        if source.name in articles_by_source:
-            source_articles = articles_by_source[source.name]
-            simulate_api_fetch(source.name, len(source_articles))
-            all_articles.extend(source_articles)
-            source.articles_fetched = len(source_articles)
-        else:
-            simulate_api_fetch(source.name, 0)
+    # Fetch from all sources concurrently; fetcher and service pull in asyncio,
+    # so they are imported only by the commands that use them
+    from fetcher import FetchEngine, SimulatedFetcher
+    engine = FetchEngine(SimulatedFetcher(articles))
+    all_articles = engine.fetch_all(sources)
     
     print(f"\n✅ Data collection complete: {len(all_articles)} articles retrieved")
     return all_articles
@@ -47,12 +53,10 @@ def demonstrate_filtering_system():
     
     # Step 1: Simulate data collection
     articles = simulate_data_collection()
-    time.sleep(1)
     
     # Step 2: Initialize filter system
     print_processing_step("INITIALIZING FILTER SYSTEM", "Setting up relevance scoring and duplicate detection...")
-    news_filter = NewsFilter()
-    time.sleep(0.5)
+    news_filter = NewsFilter(analysis_cache=analysis_cache)
     
     # Step 3: Process articles
     print_processing_step("PROCESSING ARTICLES", "Calculating relevance scores and analyzing sentiment...")
@@ -63,13 +67,11 @@ def demonstrate_filtering_system():
     
     duplicate_count = len(articles) - len(processed_articles)
     print_statistics(processed_articles, duplicate_count)
-    time.sleep(1)
     
     # Step 4: Compile magazine
     print_processing_step("COMPILING MAGAZINE", "Organizing articles into sections and generating summaries...")
     compiler = MagazineCompiler()
     magazine = compiler.compile_magazine(processed_articles)
-    time.sleep(0.5)
     
     # Step 5: Display results
     print_processing_step("GENERATING OUTPUT", "Creating consumer-ready news digest...")
@@ -78,9 +80,8 @@ def demonstrate_filtering_system():
     console_output = compiler.export_magazine(magazine, 'console')
     print(console_output)
     
-    # Save HTML version
-    html_output = compiler.export_magazine(magazine, 'html')
-    save_to_file(html_output, 'news_digest.html')
+    # Save HTML version, streamed straight to disk
+    stream_to_file(lambda f: compiler.write_html(magazine, f), 'news_digest.html')
     
     # Final summary
     print("\n🎉 NEWS AGGREGATION COMPLETE!")
@@ -97,7 +98,7 @@ def demonstrate_category_filtering():
     print("="*60)
     
     articles = generate_sample_articles()
-    news_filter = NewsFilter()
+    news_filter = NewsFilter(analysis_cache=analysis_cache)
     
     # Filter for finance news only
     print("\n📈 FINANCE NEWS FILTER")
@@ -128,7 +129,7 @@ def demonstrate_keyword_filtering():
     print("="*60)
     
     articles = generate_sample_articles()
-    news_filter = NewsFilter()
+    news_filter = NewsFilter(analysis_cache=analysis_cache)
     
     # Filter by AI-related keywords
     ai_keywords = ['artificial intelligence', 'AI', 'machine learning', 'automation']
@@ -143,7 +144,210 @@ def demonstrate_keyword_filtering():
     for article in ai_articles:
         print(f"  • {article.title} (Score: {article.relevance_score:.2f}, Source: {article.source})")
 
-if __name__ == "__main__":
+OUTPUT_FORMATS = {'.html': 'html', '.htm': 'html', '.json': 'json'}
+
+def read_articles(paths: List[str]) -> List[Article]:
+    """Read articles from JSON Lines files, optionally gzipped, or JSON arrays ('-' reads stdin)."""
+    articles = []
+    for path in paths:
+        if path == '-':
+            text = sys.stdin.read()
+        elif path.lower().endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        else:
+            articles.extend(FeedReader(path))
+            continue
+        if text.lstrip().startswith('['):
+            articles.extend(Article.from_dict(record) for record in json.loads(text))
+        else:
+            articles.extend(Article.from_dict(json.loads(line)) for line in text.splitlines() if line.strip())
+    return articles
+
+def fetch_feeds(feed_urls: Dict[str, str], state_path: str) -> List[Article]:
+    """Poll HTTP feeds of known sources, returning only articles not seen on earlier runs."""
+    from fetcher import FetchEngine
+    from http_fetch import FeedStateStore, HttpFetcher
+    sources = {source.name: source for source in get_news_sources()}
+    unknown = sorted(set(feed_urls) - set(sources))
+    if unknown:
+        raise ValueError(f"Unknown feed sources: {', '.join(unknown)}")
+    with HttpFetcher(feed_urls, FeedStateStore(state_path)) as fetcher:
+        return FetchEngine(fetcher).fetch_all([sources[name] for name in feed_urls])
+
+def _feed_url(value: str) -> Tuple[str, str]:
+    name, separator, url = value.partition('=')
+    if not separator or not name or not url:
+        raise argparse.ArgumentTypeError(f"expected SOURCE=URL, got {value!r}")
+    return name, url
+
+def run_batch(input_paths: List[str], output_path: str, format_type: str = None,
+              keyword_filter: List[str] = None, category_filter: List[NewsCategory] = None,
+              source_filter: List[str] = None, remove_duplicates: bool = True,
+              workers: int = 1, dedup_window: timedelta = None,
+              recency: RecencyDecay = None, dedup_method: str = 'auto',
+              matcher_cache: str = None, feed_urls: Dict[str, str] = None,
+              fetch_state: str = None) -> Dict:
+    """Run the pipeline headlessly from input files to an output file and return timings."""
+    profiler = PipelineProfiler()
+    start = time.perf_counter()
+    
+    with profiler.stage('read') as stage:
+        if input_paths:
+            articles = read_articles(input_paths)
+        elif feed_urls:
+            articles = fetch_feeds(feed_urls, fetch_state)
+        else:
+            from fetcher import FetchEngine, SimulatedFetcher
+            sources = get_news_sources()
+            engine = FetchEngine(SimulatedFetcher(generate_sample_articles(), simulate_delay=False))
+            articles = engine.fetch_all(sources)
+        stage.items = len(articles)
+    
+    news_filter = NewsFilter(analysis_cache=analysis_cache, profiler=profiler,
+                             dedup_window=dedup_window, recency=recency, dedup_method=dedup_method,
+                             matcher_cache=matcher_cache)
+    processed_articles = news_filter.process_articles(
+        articles, keyword_filter, category_filter, source_filter,
+        remove_duplicates=remove_duplicates, workers=workers
+    )
+    
+    compiler = MagazineCompiler(profiler=profiler, recency=recency)
+    magazine = compiler.compile_magazine(processed_articles)
+    
+    format_type = format_type or OUTPUT_FORMATS.get(os.path.splitext(output_path)[1].lower(), 'console')
+    out = sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8')
+    try:
+        with profiler.stage('write', magazine['total_articles']):
+            if format_type == 'html':
+                compiler.write_html(magazine, out)
+            else:
+                out.write(compiler.export_magazine(magazine, format_type))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    
+    return {
+        'input_articles': len(articles),
+        'output_articles': len(processed_articles),
+        'sections': len(magazine['sections']),
+        'output': output_path,
+        'format': format_type,
+        'seconds': round(time.perf_counter() - start, 6),
+        **profiler.report()
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="News aggregation and magazine compilation.")
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('demo', help="Run the interactive demonstration (default)")
+    
+    run = commands.add_parser('run', help="Process article files headlessly")
+    run.add_argument('--input', action='append', default=[], metavar='PATH',
+                     help="JSON Lines (optionally gzipped) or JSON array article file, "
+                          "'-' for stdin; repeatable "
+                          "(default: the built-in sample articles)")
+    run.add_argument('--feed-url', action='append', dest='feed_urls', type=_feed_url, metavar='SOURCE=URL',
+                     help="Poll a source's JSON Lines feed over HTTP instead of reading files; "
+                          "repeatable, requires --fetch-state")
+    run.add_argument('--fetch-state', metavar='PATH',
+                     help="JSON file of feed validators and cursors kept between runs")
+    run.add_argument('--output', required=True, metavar='PATH',
+                     help="Output file, '-' for stdout; format follows the extension")
+    run.add_argument('--format', choices=['console', 'html', 'json'],
+                     help="Output format, overriding the extension")
+    run.add_argument('--keyword', action='append', dest='keywords', metavar='KEYWORD')
+    run.add_argument('--category', action='append', dest='categories', metavar='CATEGORY',
+                     type=NewsCategory, help="Category name, e.g. 'Finance'; repeatable")
+    run.add_argument('--source', action='append', dest='sources', metavar='SOURCE')
+    run.add_argument('--keep-duplicates', action='store_true')
+    run.add_argument('--workers', type=int, default=1)
+    run.add_argument('--dedup-method', choices=['auto', 'exact', 'lsh', 'tfidf'], default='auto')
+    run.add_argument('--dedup-window-hours', type=float, nargs='?', const=DEDUP_TIME_WINDOW_HOURS,
+                     metavar='HOURS',
+                     help="Only compare articles published this close together as duplicates "
+                          f"(default span {DEDUP_TIME_WINDOW_HOURS} h)")
+    run.add_argument('--recency-weight', type=float, metavar='POINTS',
+                     help="Rank with a freshness bonus of up to this many points")
+    run.add_argument('--recency-half-life', type=float, default=RECENCY_HALF_LIFE_HOURS, metavar='HOURS')
+    run.add_argument('--timing', metavar='PATH',
+                     help="Write the JSON timing report here instead of stderr")
+    run.add_argument('--matcher-cache', metavar='PATH',
+                     help="Load the matchers serialized by build-matchers; "
+                          "relative paths are under the source directory")
+    run.add_argument('--log-level', default='WARNING')
+    
+    serve = commands.add_parser('serve', help="Run the resident pipeline service on a Unix socket")
+    serve.add_argument('--socket', default=SERVICE_SOCKET_PATH, metavar='PATH')
+    serve.add_argument('--workers', type=int, default=SERVICE_WORKERS)
+    serve.add_argument('--queue-size', type=int, default=SERVICE_QUEUE_SIZE)
+    serve.add_argument('--data-dir', default=SERVICE_DATA_DIR, metavar='DIR',
+                       help="Directory that job feed and output paths are resolved in")
+    serve.add_argument('--score-workers', type=int, default=1,
+                       help="Processes each job's scoring is sharded across")
+    serve.add_argument('--matcher-cache', metavar='PATH',
+                       help="Load the matchers serialized by build-matchers; "
+                            "relative paths are under the source directory")
+    serve.add_argument('--log-level', default='INFO')
+    
+    build = commands.add_parser('build-matchers',
+                                help="Serialize the compiled keyword matchers for faster start-up")
+    build.add_argument('--path', default=MATCHER_CACHE_PATH,
+                       help="Where to write; relative paths are under the source directory")
+    return parser
+
+async def serve(socket_path: str, workers: int, queue_size: int,
+                data_dir: str = SERVICE_DATA_DIR, score_workers: int = 1,
+                matcher_cache: str = None) -> None:
+    """Run a PipelineService on a Unix socket until interrupted."""
+    from service import PipelineService
+    async with PipelineService(workers, queue_size, data_dir, score_workers, matcher_cache) as service:
+        await service.serve_unix(socket_path)
+
+def main(argv: List[str] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'build-matchers':
+        save_compiled(args.path)
+        print(f"Compiled matchers written to {matcher_cache_path(args.path)}")
+        return 0
+    if args.command == 'serve':
+        import asyncio
+        setup_logging(args.log_level)
+        try:
+            asyncio.run(serve(args.socket, args.workers, args.queue_size, args.data_dir,
+                              args.score_workers, args.matcher_cache))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command != 'run':
+        run_demonstration()
+        return 0
+    
+    if args.feed_urls and not args.fetch_state:
+        parser.error("--feed-url requires --fetch-state")
+    setup_logging(args.log_level)
+    dedup_window = timedelta(hours=args.dedup_window_hours) if args.dedup_window_hours else None
+    recency = RecencyDecay(args.recency_weight, args.recency_half_life) if args.recency_weight else None
+    try:
+        report = run_batch(args.input, args.output, args.format, args.keywords,
+                           args.categories, args.sources, not args.keep_duplicates, args.workers,
+                           dedup_window, recency, args.dedup_method, args.matcher_cache,
+                           dict(args.feed_urls or ()), args.fetch_state)
+    except (OSError, ValueError, KeyError) as e:
+        logging.getLogger(__name__).error(f"Batch run failed: {e}")
+        return 1
+    
+    if args.timing:
+        with open(args.timing, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stderr)
+        sys.stderr.write('\n')
+    return 0
+
+def run_demonstration():
+    """Run every demonstration followed by the extension guide."""
     # Run the main demonstration
     magazine, processed_articles = demonstrate_filtering_system()
     
@@ -188,4 +392,9 @@ To extend this system for real web scraping and API integration:
    - Add load balancing and auto-scaling
 """)
     
-    print("🎯 System demonstration completed successfully!")
\ No newline at end of file
+    cache_stats = analysis_cache.stats()
+    print(f"♻️  Analysis cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    print("🎯 System demonstration completed successfully!")
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,369 @@
+"""
+Precompiled keyword matching for relevance scoring and sentiment analysis.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+from models import Article, NewsCategory, Sentiment
+from config import CATEGORY_KEYWORDS, KEYWORD_WEIGHTS, SENTIMENT_KEYWORDS, MATCHER_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+class AnalyzedText:
+    """Lowercased text and token counts of an article, computed once per pipeline run."""
+
+    __slots__ = ('title', 'text', 'content_length', '_token_counts')
+
+    def __init__(self, title: str, content: str):
+        self.title = title.lower()
+        self.text = f"{title} {content}".lower()
+        self.content_length = len(content)
+        self._token_counts = None
+
+    @classmethod
+    def from_article(cls, article: Article) -> 'AnalyzedText':
+        return cls(article.title, article.content)
+
+    @property
+    def token_counts(self) -> Counter:
+        """Occurrences of each word token; a keyword made of word characters only
+        matches r'\bkeyword\b' exactly where it appears as a whole token."""
+        if self._token_counts is None:
+            self._token_counts = Counter(_TOKEN_PATTERN.findall(self.text))
+        return self._token_counts
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercased text into word tokens."""
+    return _TOKEN_PATTERN.findall(text)
+
+def _is_token(keyword: str) -> bool:
+    return _TOKEN_PATTERN.fullmatch(keyword) is not None
+
+class KeywordMatcher:
+    """Counts occurrences of a fixed keyword set with one combined regex scan.
+
+    The pattern is a zero-width lookahead over an alternation of all keywords
+    (longest first), so every start position is visited once in C. Shorter
+    keywords that are prefixes of the longest match at a position are checked
+    directly, which keeps overlapping keywords (e.g. 'breakthrough' inside
+    'medical breakthrough') counted exactly like independent per-keyword scans.
+    """
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = sorted({kw.lower() for kw in keywords if kw}, key=lambda kw: (-len(kw), kw))
+
+        # Single-token keywords can be counted from shared token counts;
+        # only multi-word phrases need the regex scan
+        self.tokens = [kw for kw in self.keywords if _is_token(kw)]
+        self.phrases = [kw for kw in self.keywords if not _is_token(kw)]
+
+        # Keywords that are proper prefixes of each keyword, longest first
+        self._prefixes = self._build_prefixes(self.keywords)
+        self._phrase_prefixes = self._build_prefixes(self.phrases)
+
+        # Patterns are compiled on first use and never pickled, so a matcher
+        # loaded from the build cache only compiles the scans it runs
+        alternation = '|'.join(re.escape(kw) for kw in self.keywords)
+        phrase_alternation = '|'.join(re.escape(kw) for kw in self.phrases)
+        self._sources = {
+            'bounded': rf'(?=\b({alternation})\b)' if self.keywords else None,
+            'unbounded': rf'(?=({alternation}))' if self.keywords else None,
+            'phrase_bounded': rf'(?=\b({phrase_alternation})\b)' if self.phrases else None
+        }
+        self._patterns = {}
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_patterns'] = {}
+        return state
+
+    def _pattern(self, name: str):
+        try:
+            return self._patterns[name]
+        except KeyError:
+            source = self._sources[name]
+            pattern = self._patterns[name] = re.compile(source) if source is not None else None
+            return pattern
+
+    @staticmethod
+    def _build_prefixes(keywords: List[str]) -> Dict[str, List[str]]:
+        return {
+            keyword: [other for other in keywords
+                      if len(other) < len(keyword) and keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+    def count(self, text: str, token_counts: Counter = None) -> Dict[str, int]:
+        """Count whole-word, non-overlapping matches of each keyword in lowercased text.
+
+        When the text's token counts are supplied, single-token keywords are
+        looked up there and only phrases are scanned for.
+        """
+        if token_counts is None:
+            return self._scan(text, self._pattern('bounded'), self._prefixes)
+
+        counts = self._scan(text, self._pattern('phrase_bounded'), self._phrase_prefixes)
+        for keyword in self.tokens:
+            occurrences = token_counts.get(keyword, 0)
+            if occurrences:
+                counts[keyword] = occurrences
+        return counts
+
+    @staticmethod
+    def _scan(text: str, pattern, prefixes: Dict[str, List[str]]) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        if pattern is None:
+            return counts
+
+        next_start: Dict[str, int] = {}
+        for match in pattern.finditer(text):
+            start = match.start()
+            keyword = match.group(1)
+            candidates = [keyword]
+            for prefix in prefixes[keyword]:
+                if _is_word_boundary(text, start + len(prefix)):
+                    candidates.append(prefix)
+
+            for candidate in candidates:
+                # Repeated matches of one keyword must not overlap, as with re.findall
+                if start < next_start.get(candidate, 0):
+                    continue
+                counts[candidate] = counts.get(candidate, 0) + 1
+                next_start[candidate] = start + len(candidate)
+
+        return counts
+
+    def present(self, text: str) -> set:
+        """Return the keywords that occur anywhere in lowercased text as substrings."""
+        found = set()
+        pattern = self._pattern('unbounded')
+        if pattern is None:
+            return found
+
+        for match in pattern.finditer(text):
+            keyword = match.group(1)
+            found.add(keyword)
+            found.update(self._prefixes[keyword])
+
+        return found
+
+def _config_digest(config) -> str:
+    """Short stable digest of a keyword config, used to version cached results."""
+    encoded = json.dumps(config, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+def _relevance_digest(category_keywords: Dict, keyword_weights: Dict[str, float]) -> str:
+    return _config_digest({
+        'categories': {category.value: priorities for category, priorities in category_keywords.items()},
+        'weights': keyword_weights
+    })
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Mirror the semantics of the regex \\b assertion at a position."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+class RelevanceScorer:
+    """Relevance scoring engine compiled once from the category keyword config."""
+
+    def __init__(self, category_keywords: Dict = None, keyword_weights: Dict[str, float] = None):
+        category_keywords = CATEGORY_KEYWORDS if category_keywords is None else category_keywords
+        keyword_weights = KEYWORD_WEIGHTS if keyword_weights is None else keyword_weights
+        self.category_keywords = category_keywords
+        self.keyword_weights = keyword_weights
+        self.version = _relevance_digest(category_keywords, keyword_weights)
+
+        self._matchers: Dict[NewsCategory, KeywordMatcher] = {}
+        self._weighted_keywords: Dict[NewsCategory, List[Tuple[str, float]]] = {}
+
+        for category, priorities in category_keywords.items():
+            # Keep every (keyword, weight) entry in config order so repeated
+            # keywords across tiers are weighted and summed exactly as before
+            entries = []
+            for priority, keywords in priorities.items():
+                weight = keyword_weights.get(priority, 1.0)
+                entries.extend((keyword.lower(), weight) for keyword in keywords)
+
+            self._weighted_keywords[category] = entries
+            self._matchers[category] = KeywordMatcher([keyword for keyword, _ in entries])
+
+    def keyword_counts(self, text: str, category: NewsCategory,
+                       token_counts: Counter = None) -> Dict[str, float]:
+        """Return weighted per-keyword match counts for lowercased text."""
+        matcher = self._matchers.get(category)
+        if matcher is None:
+            return {}
+
+        counts = matcher.count(text, token_counts)
+        weighted: Dict[str, float] = {}
+        for keyword, weight in self._weighted_keywords[category]:
+            if keyword in counts:
+                weighted[keyword] = weighted.get(keyword, 0.0) + counts[keyword] * weight
+
+        return weighted
+
+    def score(self, article: Article, analyzed: AnalyzedText = None) -> float:
+        """Calculate relevance score based on keyword frequency and importance."""
+        if analyzed is None:
+            analyzed = AnalyzedText.from_article(article)
+        return self.score_analyzed(analyzed, article.category)
+
+    def score_analyzed(self, analyzed: AnalyzedText, category: NewsCategory) -> float:
+        """Calculate relevance score from already analyzed article text."""
+        matcher = self._matchers.get(category)
+        entries = self._weighted_keywords.get(category, [])
+        score = 0.0
+
+        if matcher is not None:
+            counts = matcher.count(analyzed.text, analyzed.token_counts)
+            for keyword, weight in entries:
+                score += counts.get(keyword, 0) * weight
+
+            # Bonus for title keywords
+            title_keywords = matcher.present(analyzed.title)
+            for keyword, weight in entries:
+                if keyword in title_keywords:
+                    score += weight * 1.5  # Title keywords are more important
+
+        # Normalize score by content length
+        if analyzed.content_length > 0:
+            score = score / (analyzed.content_length / 100)  # Normalize per 100 characters
+
+        return round(score, 2)
+
+class SentimentLexicon:
+    """Compiled positive/negative lexicon that tallies hits from shared token counts."""
+
+    def __init__(self, sentiment_keywords: Dict[str, List[str]] = None):
+        self.update(SENTIMENT_KEYWORDS if sentiment_keywords is None else sentiment_keywords)
+
+    def update(self, sentiment_keywords: Dict[str, List[str]]) -> None:
+        """Rebuild the lexicon from new keyword lists; safe to call on a live filter."""
+        version = _config_digest(sentiment_keywords)
+        # token -> (positive weight, negative weight); repeated entries count repeatedly
+        polarity: Dict[str, Tuple[int, int]] = {}
+        phrases = {'positive': [], 'negative': []}
+
+        for label, index in (('positive', 0), ('negative', 1)):
+            for keyword in sentiment_keywords.get(label, []):
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                if _is_token(keyword):
+                    weights = list(polarity.get(keyword, (0, 0)))
+                    weights[index] += 1
+                    polarity[keyword] = tuple(weights)
+                else:
+                    phrases[label].append(keyword)
+
+        phrase_matchers = {label: (KeywordMatcher(keywords), Counter(keywords))
+                           for label, keywords in phrases.items() if keywords}
+
+        # Publish the config, version and tables in one assignment so concurrent
+        # readers never pair the new version with the old tables
+        self._state = (sentiment_keywords, version, polarity, phrase_matchers)
+
+    @property
+    def sentiment_keywords(self) -> Dict[str, List[str]]:
+        return self._state[0]
+
+    @property
+    def version(self) -> str:
+        return self._state[1]
+
+    def tally(self, analyzed: AnalyzedText) -> Tuple[int, int]:
+        """Return (positive, negative) keyword hit counts for an article's text."""
+        _, _, polarity, phrase_matchers = self._state
+        positive_score = 0
+        negative_score = 0
+
+        for token, occurrences in analyzed.token_counts.items():
+            weights = polarity.get(token)
+            if weights is not None:
+                positive_score += weights[0] * occurrences
+                negative_score += weights[1] * occurrences
+
+        for label, (matcher, multiplicity) in phrase_matchers.items():
+            hits = sum(count * multiplicity[keyword]
+                       for keyword, count in matcher.count(analyzed.text).items())
+            if label == 'positive':
+                positive_score += hits
+            else:
+                negative_score += hits
+
+        return positive_score, negative_score
+
+    def classify(self, analyzed: AnalyzedText) -> Sentiment:
+        """Determine sentiment from the balance of positive and negative hits."""
+        positive_score, negative_score = self.tally(analyzed)
+
+        if positive_score > negative_score:
+            return Sentiment.POSITIVE
+        elif negative_score > positive_score:
+            return Sentiment.NEGATIVE
+        else:
+            return Sentiment.NEUTRAL
+
+# Bumped whenever the pickled layout of the matchers changes
+_ARTIFACT_FORMAT = 2
+
+# Relative matcher cache paths live beside the source, never in the working directory
+_MATCHER_CACHE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def matcher_cache_path(path: str = MATCHER_CACHE_PATH) -> str:
+    """Absolute location of a matcher cache; relative paths are taken from the source directory."""
+    return os.path.join(_MATCHER_CACHE_DIR, path)
+
+def save_compiled(path: str = MATCHER_CACHE_PATH, relevance_scorer: RelevanceScorer = None,
+                  sentiment_lexicon: SentimentLexicon = None) -> None:
+    """Build the matchers for the keyword config (unless given) and serialize them to path."""
+    path = matcher_cache_path(path)
+    relevance_scorer = relevance_scorer or RelevanceScorer()
+    sentiment_lexicon = sentiment_lexicon or SentimentLexicon()
+    payload = pickle.dumps(
+        (_ARTIFACT_FORMAT, relevance_scorer.version, sentiment_lexicon.version,
+         relevance_scorer, sentiment_lexicon),
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temporary_path, path)
+
+def load_compiled(path: str) -> Tuple[RelevanceScorer, SentimentLexicon]:
+    """Matchers for the current keyword config, read from path when it holds a build of it.
+
+    The artifact is unpickled, so only pass a path written by save_compiled
+    that nobody else can write to. It is loaded with a single read and skips
+    rebuilding keyword tables; a missing, unreadable or stale artifact falls
+    back to building the matchers from config.
+    """
+    path = matcher_cache_path(path)
+    try:
+        with open(path, 'rb') as f:
+            artifact = pickle.loads(f.read())
+    except FileNotFoundError:
+        artifact = None
+    except Exception as e:  # Unpickling a damaged file can raise almost anything
+        logger.warning(f"Ignoring unreadable matcher cache {path}: {e!r}")
+        artifact = None
+
+    if isinstance(artifact, tuple) and artifact[:3] == (
+            _ARTIFACT_FORMAT,
+            _relevance_digest(CATEGORY_KEYWORDS, KEYWORD_WEIGHTS),
+            _config_digest(SENTIMENT_KEYWORDS)):
+        return artifact[3], artifact[4]
+    if artifact is not None:
+        logger.info(f"Matcher cache {path} is stale; rebuilding from config")
+    return RelevanceScorer(), SentimentLexicon()
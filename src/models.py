@@ -1,8 +1,10 @@
 """
 News aggregation system models and core data structures.
 """
-from datetime import datetime
-from typing import List, Dict, Optional
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import List, Dict, Iterable, Iterator, Optional
 from enum import Enum
 
 class Sentiment(Enum):
@@ -21,11 +23,14 @@ class NewsCategory(Enum):
 class Article:
     """Represents a news article with all relevant metadata."""
     
+    __slots__ = ('title', 'source', 'publication_date', 'content', 'category',
+                 'keywords', 'url', 'relevance_score', 'sentiment', 'processed')
+    
     def __init__(self, title: str, source: str, publication_date: datetime, 
                  content: str, category: NewsCategory, keywords: List[str], 
                  url: str = ""):
         self.title = title
-        self.source = source
+        self.source = sys.intern(source)  # A handful of sources shared by millions of articles
         self.publication_date = publication_date
         self.content = content
         self.category = category
@@ -56,6 +61,244 @@ class Article:
             'processed': self.processed
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Article':
+        """Build an article from a dictionary in the to_dict() format.
+
+        Only title, source, publication_date, content and category are
+        required; analysis fields are restored when present. Dates may be
+        ISO 8601, RFC 2822 or Unix timestamps (see parse_date), and
+        categories may be given by value or by name.
+        """
+        article = cls(
+            data['title'],
+            data['source'],
+            parse_date(data['publication_date']),
+            data['content'],
+            _CATEGORY_LOOKUP[data['category']],
+            list(data.get('keywords') or []),
+            data.get('url') or ''
+        )
+        if 'relevance_score' in data:
+            article.relevance_score = data['relevance_score']
+        if 'sentiment' in data:
+            article.sentiment = _SENTIMENT_LOOKUP[data['sentiment']]
+        article.processed = data.get('processed', False)
+        return article
+
+def parse_date(value) -> datetime:
+    """Parse an ISO 8601 string, RFC 2822 string or Unix timestamp to a naive local datetime.
+
+    Dates that cannot be represented raise ValueError, like malformed ones.
+    """
+    try:
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                # RSS-style dates; the email package is slow to import and rarely needed
+                from email.utils import parsedate_to_datetime
+                parsed = parsedate_to_datetime(value)
+        else:
+            parsed = datetime.fromtimestamp(value, timezone.utc)
+
+        if parsed.tzinfo is not None:
+            # Compare cleanly with the naive local datetimes used elsewhere
+            parsed = parsed.astimezone().replace(tzinfo=None)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"Date out of range: {value!r}") from e
+    return parsed
+
+# Dict lookups avoid the comparatively slow Enum call per record
+_CATEGORY_LOOKUP = {**{category.value: category for category in NewsCategory},
+                    **{category.name: category for category in NewsCategory}}
+_SENTIMENT_LOOKUP = {sentiment.value: sentiment for sentiment in Sentiment}
+
+def _view_property(name: str) -> property:
+    return property(lambda view: getattr(view._article, name))
+
+class ArticleView:
+    """Read-only view of an Article held by a compiled magazine.
+    
+    Renderers read the article's typed fields through the view; a dict is
+    only built when the magazine is serialized. Views have the attributes,
+    str() and to_dict() of an Article, and view['field'] reads the to_dict()
+    value for code written against the old dict-based magazine sections.
+    """
+    
+    __slots__ = ('_article',)
+    
+    title = _view_property('title')
+    source = _view_property('source')
+    publication_date = _view_property('publication_date')
+    content = _view_property('content')
+    category = _view_property('category')
+    keywords = _view_property('keywords')
+    url = _view_property('url')
+    relevance_score = _view_property('relevance_score')
+    sentiment = _view_property('sentiment')
+    processed = _view_property('processed')
+    
+    def __init__(self, article: Article):
+        object.__setattr__(self, '_article', article)
+    
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"ArticleView is read-only; cannot set '{name}'")
+    
+    def __str__(self) -> str:
+        return str(self._article)
+    
+    def __repr__(self) -> str:
+        return f"ArticleView({self._article!r})"
+    
+    def __getitem__(self, key: str):
+        return self._article.to_dict()[key]
+    
+    def to_dict(self) -> Dict:
+        """Serialize the underlying article."""
+        return self._article.to_dict()
+
+_CATEGORIES = list(NewsCategory)
+_CATEGORY_CODES = {category: code for code, category in enumerate(_CATEGORIES)}
+_SENTIMENTS = list(Sentiment)
+_SENTIMENT_CODES = {sentiment: code for code, sentiment in enumerate(_SENTIMENTS)}
+_KEYWORD_SEPARATOR = '\x1f'
+_FIELDS_PER_ARTICLE = 4  # title, content, url, keywords
+
+class ArticleBatch:
+    """Columnar storage for large numbers of articles.
+    
+    Sources and categories are stored as small integer codes, scores and
+    timestamps in typed arrays, and all text in one UTF-8 buffer addressed
+    by offsets. Fields are read by row index, so hot paths can scan a batch
+    without materializing Article objects; article() builds one on demand.
+    """
+    
+    def __init__(self):
+        self.sources: List[str] = []
+        self._source_codes: Dict[str, int] = {}
+        self.source_codes = array('I')
+        self.category_codes = array('B')
+        self.timestamps = array('d')
+        self.scores = array('d')
+        self.sentiment_codes = array('B')
+        self.processed = array('B')
+        self._text = bytearray()
+        self._offsets = array('Q', [0])
+    
+    @classmethod
+    def from_articles(cls, articles: Iterable[Article]) -> 'ArticleBatch':
+        batch = cls()
+        batch.extend(articles)
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.category_codes)
+    
+    def append(self, article: Article) -> None:
+        """Add an article as a new row."""
+        code = self._source_codes.get(article.source)
+        if code is None:
+            code = self._source_codes[article.source] = len(self.sources)
+            self.sources.append(article.source)
+        
+        self.source_codes.append(code)
+        self.category_codes.append(_CATEGORY_CODES[article.category])
+        self.timestamps.append(article.publication_date.timestamp())
+        self.scores.append(article.relevance_score)
+        self.sentiment_codes.append(_SENTIMENT_CODES[article.sentiment])
+        self.processed.append(article.processed)
+        
+        for text in (article.title, article.content, article.url,
+                     _KEYWORD_SEPARATOR.join(article.keywords)):
+            self._text += text.encode('utf-8')
+            self._offsets.append(len(self._text))
+    
+    def extend(self, articles: Iterable[Article]) -> None:
+        for article in articles:
+            self.append(article)
+    
+    def _field(self, index: int, field: int) -> str:
+        position = index * _FIELDS_PER_ARTICLE + field
+        return self._text[self._offsets[position]:self._offsets[position + 1]].decode('utf-8')
+    
+    def title(self, index: int) -> str:
+        return self._field(index, 0)
+    
+    def content(self, index: int) -> str:
+        return self._field(index, 1)
+    
+    def url(self, index: int) -> str:
+        return self._field(index, 2)
+    
+    def keywords(self, index: int) -> List[str]:
+        joined = self._field(index, 3)
+        return joined.split(_KEYWORD_SEPARATOR) if joined else []
+    
+    def source(self, index: int) -> str:
+        return self.sources[self.source_codes[index]]
+    
+    def category(self, index: int) -> NewsCategory:
+        return _CATEGORIES[self.category_codes[index]]
+    
+    def sentiment(self, index: int) -> Sentiment:
+        return _SENTIMENTS[self.sentiment_codes[index]]
+    
+    def set_sentiment(self, index: int, sentiment: Sentiment) -> None:
+        self.sentiment_codes[index] = _SENTIMENT_CODES[sentiment]
+    
+    def publication_date(self, index: int) -> datetime:
+        return datetime.fromtimestamp(self.timestamps[index])
+    
+    def article(self, index: int) -> Article:
+        """Materialize one row as an Article."""
+        article = Article(
+            title=self.title(index),
+            source=self.source(index),
+            publication_date=self.publication_date(index),
+            content=self.content(index),
+            category=self.category(index),
+            keywords=self.keywords(index),
+            url=self.url(index)
+        )
+        article.relevance_score = self.scores[index]
+        article.sentiment = self.sentiment(index)
+        article.processed = bool(self.processed[index])
+        return article
+    
+    def iter_articles(self) -> Iterator[Article]:
+        """Materialize every row, one Article at a time."""
+        return (self.article(index) for index in range(len(self)))
+    
+    def rows_matching(self, categories: Iterable[NewsCategory] = None,
+                      sources: Iterable[str] = None) -> List[int]:
+        """Indices of rows in any of the categories and from any of the sources, read from the code arrays."""
+        rows = range(len(self))
+        if categories is not None:
+            category_codes = {_CATEGORY_CODES[category] for category in categories}
+            rows = [index for index in rows if self.category_codes[index] in category_codes]
+        if sources is not None:
+            source_codes = {self._source_codes[source] for source in sources if source in self._source_codes}
+            rows = [index for index in rows if self.source_codes[index] in source_codes]
+        return list(rows)
+    
+    def take(self, rows: Iterable[int]) -> 'ArticleBatch':
+        """A new batch holding copies of the given rows, in the given order."""
+        batch = ArticleBatch()
+        batch.sources = list(self.sources)
+        batch._source_codes = dict(self._source_codes)
+        columns = ('source_codes', 'category_codes', 'timestamps', 'scores', 'sentiment_codes', 'processed')
+        for index in rows:
+            for column in columns:
+                getattr(batch, column).append(getattr(self, column)[index])
+            first = index * _FIELDS_PER_ARTICLE
+            start = self._offsets[first]
+            shift = len(batch._text) - start
+            batch._text += self._text[start:self._offsets[first + _FIELDS_PER_ARTICLE]]
+            batch._offsets.extend(self._offsets[position] + shift
+                                  for position in range(first + 1, first + _FIELDS_PER_ARTICLE + 1))
+        return batch
+
 class NewsSource:
     """Represents a news source with its characteristics."""
     
@@ -64,10 +307,27 @@ class NewsSource:
         self.reliability_score = reliability_score  # 0.0 to 1.0
         self.categories = categories
         self.articles_fetched = 0
+        self.fetch_latencies: List[float] = []  # seconds, one per attempt
+        self.fetch_failures = 0
+        self.last_error: Optional[str] = None
     
     def __str__(self) -> str:
         return f"{self.name} (Reliability: {self.reliability_score})"
     
     def can_provide_category(self, category: NewsCategory) -> bool:
         """Check if this source provides articles for a given category."""
-        return category in self.categories
\ No newline at end of file
+        return category in self.categories
+    
+    def record_fetch(self, latency: float, error: Optional[str] = None) -> None:
+        """Record the latency and outcome of one fetch attempt."""
+        self.fetch_latencies.append(latency)
+        if error:
+            self.fetch_failures += 1
+            self.last_error = error
+    
+    @property
+    def average_latency(self) -> float:
+        """Mean fetch attempt latency in seconds."""
+        if not self.fetch_latencies:
+            return 0.0
+        return sum(self.fetch_latencies) / len(self.fetch_latencies)
\ No newline at end of file
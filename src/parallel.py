@@ -0,0 +1,75 @@
+"""
+Multi-process relevance and sentiment scoring for large article batches.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Dict, List, Tuple
+from models import Article, NewsCategory, Sentiment
+from matching import AnalyzedText, RelevanceScorer, SentimentLexicon
+
+# Set once per worker process by _init_worker or _init_compiled
+_relevance_scorer: RelevanceScorer = None
+_sentiment_lexicon: SentimentLexicon = None
+
+MAX_CHUNK_SIZE = 1000
+CHUNKS_PER_WORKER = 4
+
+def _init_worker(category_keywords: Dict, keyword_weights: Dict[str, float],
+                 sentiment_keywords: Dict[str, List[str]]) -> None:
+    global _relevance_scorer, _sentiment_lexicon
+    _relevance_scorer = RelevanceScorer(category_keywords, keyword_weights)
+    _sentiment_lexicon = SentimentLexicon(sentiment_keywords)
+
+def _init_compiled(relevance_scorer: RelevanceScorer, sentiment_lexicon: SentimentLexicon) -> None:
+    global _relevance_scorer, _sentiment_lexicon
+    _relevance_scorer = relevance_scorer
+    _sentiment_lexicon = sentiment_lexicon
+
+def create_scoring_pool(workers: int, relevance_scorer: RelevanceScorer,
+                        sentiment_lexicon: SentimentLexicon,
+                        mp_context: BaseContext = None) -> ProcessPoolExecutor:
+    """A long-lived pool for score_in_parallel whose workers receive the compiled matchers once.
+
+    The caller owns the pool and shuts it down. Pass a 'spawn' or
+    'forkserver' context when the pool is created from a multi-threaded
+    process.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_compiled,
+                               initargs=(relevance_scorer, sentiment_lexicon))
+
+def _score_chunk(payloads: List[Tuple[str, str, str]]) -> List[Tuple[float, str]]:
+    results = []
+    for title, content, category in payloads:
+        analyzed = AnalyzedText(title, content)
+        results.append((
+            _relevance_scorer.score_analyzed(analyzed, NewsCategory(category)),
+            _sentiment_lexicon.classify(analyzed).value
+        ))
+    return results
+
+def score_in_parallel(articles: List[Article], workers: int,
+                      relevance_scorer: RelevanceScorer,
+                      sentiment_lexicon: SentimentLexicon,
+                      executor: ProcessPoolExecutor = None) -> List[Tuple[float, Sentiment]]:
+    """Score articles across a process pool and return (score, sentiment) in input order.
+
+    Workers receive (title, content, category value) tuples and rebuild the
+    scorer and lexicon once from their keyword config, so neither Article
+    objects nor compiled matchers are pickled per task. An executor from
+    create_scoring_pool is used as is and left running; without one, a pool
+    is created for this call.
+    """
+    payloads = [(article.title, article.content, article.category.value) for article in articles]
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(payloads) // (workers * CHUNKS_PER_WORKER) or 1))
+    chunks = [payloads[start:start + chunk_size] for start in range(0, len(payloads), chunk_size)]
+
+    if executor is not None:
+        return _collect(executor.map(_score_chunk, chunks))
+
+    initargs = (relevance_scorer.category_keywords, relevance_scorer.keyword_weights,
+                sentiment_lexicon.sentiment_keywords)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        return _collect(executor.map(_score_chunk, chunks))
+
+def _collect(chunk_results) -> List[Tuple[float, Sentiment]]:
+    return [(score, Sentiment(sentiment)) for results in chunk_results for score, sentiment in results]
@@ -0,0 +1,157 @@
+"""
+Lightweight per-stage timing and counters for the processing pipeline.
+"""
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+class StageStats:
+    """Accumulated timings of one named pipeline stage."""
+
+    __slots__ = ('name', 'calls', 'wall_seconds', 'cpu_seconds', 'items')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.items = 0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'items': self.items,
+            'items_per_second': round(self.items_per_second, 1)
+        }
+
+class _StageTimer:
+    """Context manager timing one stage run; set .items to report throughput."""
+
+    __slots__ = ('_profiler', '_name', 'items', '_wall', '_cpu')
+
+    def __init__(self, profiler: 'PipelineProfiler', name: str, items: int):
+        self._profiler = profiler
+        self._name = name
+        self.items = items
+
+    def __enter__(self) -> '_StageTimer':
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._profiler._record(self._name, time.perf_counter() - self._wall,
+                               time.process_time() - self._cpu, self.items)
+
+class PipelineProfiler:
+    """Collects wall/CPU time per stage, named counters and peak memory.
+
+    Hooks are called as hook(stage_name, wall_seconds, cpu_seconds, items)
+    after every stage run.
+    """
+
+    enabled = True
+
+    def __init__(self, track_memory: bool = False):
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.hooks: List[Callable[[str, float, float, int], None]] = []
+        self.track_memory = track_memory
+        self._started_tracing = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stage(self, name: str, items: int = 0) -> _StageTimer:
+        """Time a block as one run of the named stage."""
+        return _StageTimer(self, name, items)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a named counter, such as pairwise comparisons."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_hook(self, hook: Callable[[str, float, float, int], None]) -> None:
+        self.hooks.append(hook)
+
+    def _record(self, name: str, wall_seconds: float, cpu_seconds: float, items: int) -> None:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(name)
+        stats.calls += 1
+        stats.wall_seconds += wall_seconds
+        stats.cpu_seconds += cpu_seconds
+        stats.items += items
+        for hook in self.hooks:
+            hook(name, wall_seconds, cpu_seconds, items)
+
+    def peak_memory_bytes(self) -> int:
+        """Peak traced Python memory if tracking, else the process's peak RSS (0 if unknown)."""
+        if self.track_memory and tracemalloc.is_tracing():
+            return tracemalloc.get_traced_memory()[1]
+        if resource is not None:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+        return 0
+
+    def report(self) -> Dict:
+        """Return all collected measurements as plain data."""
+        return {
+            'stages': {name: stats.to_dict() for name, stats in self.stages.items()},
+            'counters': dict(self.counters),
+            'peak_memory_bytes': self.peak_memory_bytes()
+        }
+
+    def stop(self) -> None:
+        """Stop memory tracing if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+class _NullStage:
+    __slots__ = ('items',)
+
+    def __enter__(self) -> '_NullStage':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+class NullProfiler:
+    """Profiler stand-in used when profiling is disabled; every call is a no-op."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str, items: int = 0) -> _NullStage:
+        return self._stage
+
+    def count(self, name: str, amount: int = 1) -> None:
+        pass
+
+NULL_PROFILER = NullProfiler()
+
+class Profiled:
+    """Gives a pipeline component a profiler attribute and a profile() context."""
+
+    profiler = NULL_PROFILER
+
+    @contextmanager
+    def profile(self, profiler: PipelineProfiler = None) -> Iterator[PipelineProfiler]:
+        """Attach a profiler for the duration of a with-block and yield it."""
+        previous = self.profiler
+        self.profiler = profiler or PipelineProfiler()
+        try:
+            yield self.profiler
+        finally:
+            self.profiler = previous
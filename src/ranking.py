@@ -0,0 +1,37 @@
+"""
+Recency-aware ranking of scored articles.
+"""
+from datetime import datetime
+from models import Article
+from config import RECENCY_WEIGHT, RECENCY_HALF_LIFE_HOURS
+
+class RecencyDecay:
+    """Freshness bonus added to relevance scores, halving every half-life.
+
+    An article published at the reference time gets the full weight, one
+    half-life older gets half of it, and so on; articles dated after the
+    reference also get the full weight. The reference defaults to the time
+    the ranking is created, so one ranking orders a batch consistently.
+    """
+
+    def __init__(self, weight: float = RECENCY_WEIGHT,
+                 half_life_hours: float = RECENCY_HALF_LIFE_HOURS,
+                 reference: datetime = None):
+        if half_life_hours <= 0:
+            raise ValueError("half_life_hours must be positive")
+        self.weight = weight
+        self.half_life_seconds = half_life_hours * 3600
+        self.reference = reference or datetime.now()
+        self._reference_timestamp = self.reference.timestamp()
+
+    def bonus_at(self, timestamp: float) -> float:
+        """Bonus for an article published at a Unix timestamp."""
+        age = self._reference_timestamp - timestamp
+        return self.weight * 0.5 ** (max(age, 0.0) / self.half_life_seconds)
+
+    def bonus(self, article: Article) -> float:
+        return self.bonus_at(article.publication_date.timestamp())
+
+    def score(self, article: Article) -> float:
+        """Relevance score plus the freshness bonus."""
+        return article.relevance_score + self.bonus(article)
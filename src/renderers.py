@@ -0,0 +1,98 @@
+"""
+Streaming output renderers for compiled magazines.
+"""
+from string import Formatter
+from typing import Callable, Iterable, List, TextIO, Tuple
+from models import Article
+from config import HTML_TEMPLATE
+
+# Single-pass HTML escaping via str.translate
+_HTML_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;'
+})
+
+def escape_html(text: str) -> str:
+    """Escape text for HTML element content and attribute values."""
+    return text.translate(_HTML_ESCAPES)
+
+class HtmlRenderer:
+    """Writes magazine HTML to a file-like object piece by piece.
+
+    The page template is parsed once into literal segments and placeholders,
+    so rendering never builds the full document in memory. Articles are read
+    directly from Article objects, one fragment per write.
+    """
+
+    def __init__(self, template: str = HTML_TEMPLATE):
+        # [(literal text, placeholder name or None)], with {{ }} already unescaped
+        self._segments = [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+    def render(self, out: TextIO, title: str, date: str, total_articles: int,
+               sections: Iterable[Tuple[str, str, List[Article]]]) -> None:
+        """Render a full page; sections are (name, summary, articles) in display order."""
+        def write_sections(out: TextIO) -> None:
+            for section_name, summary, articles in sections:
+                self.render_section(out, section_name, summary, articles)
+
+        self.render_page(out, title, date, total_articles, write_sections)
+
+    def render_page(self, out: TextIO, title: str, date: str, total_articles: int,
+                    write_sections: Callable[[TextIO], None]) -> None:
+        """Render the page around a header, with write_sections producing the section markup."""
+        for literal, field in self._segments:
+            out.write(literal)
+            if field == 'date':
+                out.write(escape_html(date))
+            elif field == 'content':
+                self.render_header(out, title, date, total_articles)
+                write_sections(out)
+            elif field is not None:
+                raise KeyError(f"Unknown template placeholder: {field}")
+
+    def render_header(self, out: TextIO, title: str, date: str, total_articles: int) -> None:
+        out.write(
+            f'<div class="header">'
+            f'<h1>📰 {escape_html(title)}</h1>'
+            f'<div class="date">{escape_html(date)} | Total Articles: {total_articles}</div>'
+            f'</div>'
+        )
+
+    def render_section(self, out: TextIO, section_name: str, summary: str, articles: List[Article]) -> None:
+        out.write(
+            f'<div class="section">'
+            f'<h2 class="section-title">🔹 {escape_html(section_name)}</h2>'
+            f'<div class="summary">{escape_html(summary)}</div>'
+        )
+        for article in articles:
+            self.render_article(out, article)
+        out.write('</div>')  # Close section
+
+    def render_article(self, out: TextIO, article: Article) -> None:
+        parts = [
+            '<div class="article">',
+            f'<div class="article-title">{escape_html(article.title)}</div>',
+            f'<div class="article-meta">'
+            f'📰 {escape_html(article.source)} | '
+            f'📅 {article.publication_date.strftime("%B %d, %Y %H:%M")}'
+            f'<span class="relevance-score">Score: {article.relevance_score:.2f}</span>'
+            f'</div>',
+            f'<div class="article-content">{escape_html(article.content)}</div>'
+        ]
+
+        # Tags
+        if article.keywords:
+            parts.append('<div class="tags">')
+            for keyword in article.keywords[:5]:
+                parts.append(f'<span class="tag">{escape_html(keyword)}</span>')
+
+            # Sentiment tag
+            sentiment = article.sentiment.value
+            parts.append(f'<span class="tag sentiment-{sentiment}">{sentiment.title()}</span>')
+            parts.append('</div>')
+
+        parts.append('</div>')  # Close article
+        out.write(''.join(parts))
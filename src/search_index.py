@@ -0,0 +1,277 @@
+"""
+Positional inverted index with boolean and phrase queries over articles.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Union
+from models import Article
+from matching import tokenize
+
+# Query syntax: terms, "quoted phrases", AND, OR, NOT and parentheses.
+# Adjacent operands without an operator are ANDed; OR binds loosest.
+_QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+
+def article_positions(article: Article) -> Dict[str, List[int]]:
+    """Map each token of an article's title and content to its positions."""
+    positions = defaultdict(list)
+    for position, token in enumerate(tokenize(f"{article.title} {article.content}".lower())):
+        positions[token].append(position)
+    return positions
+
+class InvertedIndex:
+    """Incrementally maintained token -> {document: positions} index."""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, List[int]]] = defaultdict(dict)
+        self._documents: Dict[int, Article] = {}
+        self._document_terms: Dict[int, List[str]] = {}
+        # Keyed by id(article); _documents holds a reference so ids are not reused
+        self._document_ids: Dict[int, int] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, article: Article) -> bool:
+        return id(article) in self._document_ids
+
+    def add(self, article: Article) -> int:
+        """Index an article if it is not indexed yet and return its document id."""
+        document_id = self._document_ids.get(id(article))
+        if document_id is not None:
+            return document_id
+
+        document_id = self._next_id
+        self._next_id += 1
+        self._document_ids[id(article)] = document_id
+        self._documents[document_id] = article
+
+        positions = article_positions(article)
+        for token, token_positions in positions.items():
+            self._postings[token][document_id] = token_positions
+        self._document_terms[document_id] = list(positions)
+        return document_id
+
+    def remove(self, article: Article) -> None:
+        """Drop an article and its postings from the index."""
+        document_id = self._document_ids.pop(id(article), None)
+        if document_id is None:
+            return
+
+        del self._documents[document_id]
+        for token in self._document_terms.pop(document_id):
+            postings = self._postings[token]
+            del postings[document_id]
+            if not postings:
+                del self._postings[token]
+
+    def postings(self, token: str) -> Dict[int, List[int]]:
+        return self._postings.get(token, {})
+
+    def document_id(self, article: Article) -> int:
+        return self._document_ids[id(article)]
+
+    def all_documents(self) -> Set[int]:
+        return set(self._documents)
+
+    def search(self, query: Union[str, List[str]]) -> List[Article]:
+        """Return indexed articles matching a query, in indexing order."""
+        return [self._documents[document_id] for document_id in sorted(parse_query(query).evaluate(self))]
+
+class Phrase:
+    """Consecutive tokens; a single-token phrase is a plain term."""
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = tokens
+
+    def evaluate(self, index: InvertedIndex) -> Set[int]:
+        postings = [index.postings(token) for token in self.tokens]
+        if not postings or not all(postings):
+            return set()
+
+        # Intersect from the rarest token, then verify adjacency
+        rarest = min(postings, key=len)
+        documents = set(rarest)
+        for token_postings in postings:
+            if token_postings is not rarest:
+                documents.intersection_update(token_postings)
+        if len(postings) == 1:
+            return documents
+
+        return {document for document in documents
+                if self._adjacent([token_postings[document] for token_postings in postings])}
+
+    def matches(self, positions: Dict[str, List[int]]) -> bool:
+        token_positions = [positions.get(token) for token in self.tokens]
+        if not token_positions or not all(token_positions):
+            return False
+        return len(token_positions) == 1 or self._adjacent(token_positions)
+
+    def may_match(self, text: str) -> bool:
+        # A phrase can only match lowercased text containing each of its tokens
+        return all(token in text for token in self.tokens)
+
+    @staticmethod
+    def _adjacent(token_positions: List[List[int]]) -> bool:
+        following = [set(positions) for positions in token_positions[1:]]
+        return any(all(start + offset in positions for offset, positions in enumerate(following, 1))
+                   for start in token_positions[0])
+
+    def estimate(self, index: InvertedIndex) -> int:
+        return min((len(index.postings(token)) for token in self.tokens), default=0)
+
+class And:
+    def __init__(self, operands: list):
+        self.operands = operands
+
+    def evaluate(self, index: InvertedIndex) -> Set[int]:
+        positive = [operand for operand in self.operands if not isinstance(operand, Not)]
+        negative = [operand.operand for operand in self.operands if isinstance(operand, Not)]
+
+        if positive:
+            # Evaluate cheapest operands first so intersections stay small
+            positive.sort(key=lambda operand: operand.estimate(index))
+            documents = positive[0].evaluate(index)
+            for operand in positive[1:]:
+                if not documents:
+                    break
+                documents &= operand.evaluate(index)
+        else:
+            documents = index.all_documents()
+
+        for operand in negative:
+            if not documents:
+                break
+            documents -= operand.evaluate(index)
+        return documents
+
+    def matches(self, positions: Dict[str, List[int]]) -> bool:
+        return all(operand.matches(positions) for operand in self.operands)
+
+    def may_match(self, text: str) -> bool:
+        return all(operand.may_match(text) for operand in self.operands)
+
+    def estimate(self, index: InvertedIndex) -> int:
+        return min((operand.estimate(index) for operand in self.operands), default=0)
+
+class Or:
+    def __init__(self, operands: list):
+        self.operands = operands
+
+    def evaluate(self, index: InvertedIndex) -> Set[int]:
+        documents = set()
+        for operand in self.operands:
+            documents |= operand.evaluate(index)
+        return documents
+
+    def matches(self, positions: Dict[str, List[int]]) -> bool:
+        return any(operand.matches(positions) for operand in self.operands)
+
+    def may_match(self, text: str) -> bool:
+        return any(operand.may_match(text) for operand in self.operands)
+
+    def estimate(self, index: InvertedIndex) -> int:
+        return sum(operand.estimate(index) for operand in self.operands)
+
+class Not:
+    def __init__(self, operand):
+        self.operand = operand
+
+    def evaluate(self, index: InvertedIndex) -> Set[int]:
+        return index.all_documents() - self.operand.evaluate(index)
+
+    def matches(self, positions: Dict[str, List[int]]) -> bool:
+        return not self.operand.matches(positions)
+
+    def may_match(self, text: str) -> bool:
+        return True  # A substring test cannot rule out a negation
+
+    def estimate(self, index: InvertedIndex) -> int:
+        return len(index)
+
+def parse_query(query: Union[str, List[str]]):
+    """Parse a query string, or a keyword list meaning any of the keywords (as phrases)."""
+    if not isinstance(query, str):
+        return Or([Phrase(tokenize(keyword.lower())) for keyword in query])
+    return _QueryParser(query).parse()
+
+class _QueryParser:
+    def __init__(self, query: str):
+        self.tokens = []
+        position = 0
+        query = query.strip()
+        while position < len(query):
+            match = _QUERY_TOKEN.match(query, position)
+            if not match:
+                raise ValueError(f"Cannot parse query at: {query[position:]!r}")
+            opening, closing, phrase, word = match.groups()
+            if opening or closing:
+                self.tokens.append(opening or closing)
+            elif phrase is not None:
+                self.tokens.append(('phrase', phrase))
+            elif word in ('AND', 'OR', 'NOT'):
+                self.tokens.append(word)
+            else:
+                self.tokens.append(('phrase', word))
+            position = match.end()
+        self.position = 0
+
+    def parse(self):
+        node = self._or()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.position]!r} in query")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _or(self):
+        operands = [self._and()]
+        while self._peek() == 'OR':
+            self.position += 1
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else Or(operands)
+
+    def _and(self):
+        operands = [self._not()]
+        while self._peek() not in (None, 'OR', ')'):
+            if self._peek() == 'AND':
+                self.position += 1
+            operands.append(self._not())
+        return operands[0] if len(operands) == 1 else And(operands)
+
+    def _not(self):
+        if self._peek() == 'NOT':
+            self.position += 1
+            return Not(self._not())
+        return self._primary()
+
+    def _primary(self):
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ended unexpectedly")
+        self.position += 1
+        if token == '(':
+            node = self._or()
+            if self._peek() != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            self.position += 1
+            return node
+        if isinstance(token, tuple):
+            return Phrase(tokenize(token[1].lower()))
+        raise ValueError(f"Unexpected {token!r} in query")
+
+def matches_query(article: Article, query: Union[str, List[str]]) -> bool:
+    """Evaluate a query against a single article without an index."""
+    return parse_query(query).matches(article_positions(article))
+
+def iter_matching(articles: Iterable[Article], query: Union[str, List[str]]):
+    """Lazily yield articles matching a query, parsing it once.
+
+    A substring test on the lowercased text skips tokenizing articles that
+    cannot match, which for selective queries is most of them.
+    """
+    node = parse_query(query)
+    for article in articles:
+        if node.may_match(f"{article.title} {article.content}".lower()) and node.matches(article_positions(article)):
+            yield article
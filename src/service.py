@@ -0,0 +1,288 @@
+"""
+Resident pipeline service: a bounded job queue served by a pool of workers.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from models import Article, NewsCategory
+from filters import NewsFilter
+from compiler import MagazineCompiler
+from analysis_cache import AnalysisCache
+from ingest import FeedReader
+from config import SERVICE_WORKERS, SERVICE_QUEUE_SIZE, SERVICE_SOCKET_PATH, SERVICE_DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ('process', 'ingest', 'compile')
+
+class ServiceBusy(Exception):
+    """Raised by try_submit when the job queue is full."""
+
+def resolve_data_path(data_dir: str, path: str) -> str:
+    """Resolve a job's relative path inside data_dir, refusing anything that escapes it."""
+    if not isinstance(path, str) or not path or os.path.isabs(path) or '..' in path.replace('\\', '/').split('/'):
+        raise ValueError(f"Job paths must be relative to the data directory without '..': {path!r}")
+    root = os.path.realpath(data_dir)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"Job path {path!r} resolves outside the data directory")
+    return resolved
+
+class Job:
+    """One queued unit of work and the future its result is delivered to."""
+
+    __slots__ = ('kind', 'payload', 'future', 'enqueued_at', 'started_at')
+
+    def __init__(self, kind: str, payload: Dict, future: asyncio.Future):
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self.kind = kind
+        self.payload = payload
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+
+class _Worker:
+    """Pipeline objects owned by one worker thread."""
+
+    def __init__(self, template: NewsFilter, data_dir: str, score_workers: int, scoring_pool=None):
+        self.data_dir = data_dir
+        self.score_workers = score_workers
+        self.news_filter = NewsFilter(analysis_cache=AnalysisCache(), scoring_pool=scoring_pool)
+        # Compiled matchers are read-only and shared by every worker
+        self.news_filter.relevance_scorer = template.relevance_scorer
+        self.news_filter.sentiment_lexicon = template.sentiment_lexicon
+        self.compiler = MagazineCompiler()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def run(self, job: Job):
+        payload = job.payload
+        output = payload.get('output')
+        if output is not None:
+            output_path = resolve_data_path(self.data_dir, output)
+        if job.kind == 'ingest':
+            reader = FeedReader([resolve_data_path(self.data_dir, path) for path in payload['paths']])
+            articles = list(reader)
+        else:
+            articles = [article if isinstance(article, Article) else Article.from_dict(article)
+                        for article in payload.get('articles', ())]
+
+        categories = payload.get('category_filter')
+        processed = self.news_filter.process_articles(
+            articles,
+            keyword_filter=payload.get('keyword_filter'),
+            category_filter=[NewsCategory(category) for category in categories] if categories else None,
+            source_filter=payload.get('source_filter'),
+            remove_duplicates=payload.get('remove_duplicates', True),
+            workers=self.score_workers
+        )
+        if job.kind != 'compile':
+            return processed
+
+        magazine = self.compiler.compile_magazine(processed)
+        format_type = payload.get('format', 'json')
+        if output is None:
+            return self.compiler.to_serializable(magazine) if format_type == 'json' \
+                else self.compiler.export_magazine(magazine, format_type)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if format_type == 'html':
+                self.compiler.write_html(magazine, f)
+            else:
+                f.write(self.compiler.export_magazine(magazine, format_type))
+        return {'output': output, 'total_articles': magazine['total_articles']}
+
+class PipelineService:
+    """Keeps config and compiled matchers loaded and runs pipeline jobs from a queue.
+
+    Jobs are 'process' (filter, score and deduplicate articles), 'ingest'
+    (the same for JSON Lines feed paths) and 'compile' (process, then
+    compile a magazine, optionally written to an output path). Each worker
+    runs jobs in its own thread with its own NewsFilter and analysis cache,
+    sharing one set of compiled matchers, so the event loop stays free to
+    accept work. The queue is bounded: submit() waits for room and
+    try_submit() raises ServiceBusy, which is how backpressure reaches
+    producers.
+
+    Worker threads share the GIL, so several workers overlap file I/O but
+    not the pure-Python scoring and deduplication. With score_workers > 1,
+    start() creates one spawned process pool holding the compiled matchers,
+    and every job's scoring is sharded across it (see parallel.py). Feed paths and output paths of jobs are resolved
+    inside data_dir; absolute paths and '..' are rejected.
+    """
+
+    def __init__(self, workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 data_dir: str = SERVICE_DATA_DIR, score_workers: int = 1,
+                 matcher_cache: str = None):
+        self.worker_count = workers
+        self.queue_size = queue_size
+        self.data_dir = data_dir
+        self.score_workers = score_workers
+        self._template = NewsFilter(matcher_cache=matcher_cache)
+        self._workers: List[_Worker] = []
+        self._tasks: List[asyncio.Task] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._scoring_pool = None
+        self._busy = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.score_workers > 1:
+            from parallel import create_scoring_pool
+            # Spawned, not forked: the pool is used from the workers' executor threads
+            self._scoring_pool = create_scoring_pool(
+                self.score_workers, self._template.relevance_scorer, self._template.sentiment_lexicon,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        self._workers = [_Worker(self._template, self.data_dir, self.score_workers, self._scoring_pool)
+                         for _ in range(self.worker_count)]
+        self._tasks = [asyncio.create_task(self._work(worker)) for worker in self._workers]
+        logger.info(f"Pipeline service started with {self.worker_count} workers")
+
+    async def stop(self) -> None:
+        """Finish queued jobs, then stop the workers."""
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for worker in self._workers:
+            worker.executor.shutdown()
+        if self._scoring_pool is not None:
+            self._scoring_pool.shutdown()
+            self._scoring_pool = None
+        self._tasks = []
+        logger.info("Pipeline service stopped")
+
+    async def __aenter__(self) -> 'PipelineService':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _enqueued(self, job: Job) -> asyncio.Future:
+        self.submitted += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return job.future
+
+    async def submit(self, kind: str, **payload):
+        """Queue a job, waiting while the queue is full, and return its result."""
+        job = Job(kind, payload, asyncio.get_running_loop().create_future())
+        await self._queue.put(job)
+        return await self._enqueued(job)
+
+    def try_submit(self, kind: str, **payload) -> asyncio.Future:
+        """Queue a job without waiting; returns a future or raises ServiceBusy."""
+        job = Job(kind, payload, asyncio.get_running_loop().create_future())
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise ServiceBusy(f"Job queue is full ({self.queue_size} jobs)")
+        return self._enqueued(job)
+
+    async def _work(self, worker: _Worker) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.started_at = time.perf_counter()
+            self._wait_seconds += job.started_at - job.enqueued_at
+            self._busy += 1
+            try:
+                result = await loop.run_in_executor(worker.executor, worker.run, job)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"{job.kind} job failed: {e!r}")
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self.completed += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._busy -= 1
+                self._run_seconds += time.perf_counter() - job.started_at
+                self._queue.task_done()
+
+    def metrics(self) -> Dict[str, float]:
+        """Queue depth, throughput counters and mean wait/run times."""
+        finished = self.completed + self.failed
+        return {
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'max_queue_depth': self.max_queue_depth,
+            'queue_capacity': self.queue_size,
+            'busy_workers': self._busy,
+            'workers': self.worker_count,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'average_wait_seconds': round(self._wait_seconds / finished, 6) if finished else 0.0,
+            'average_run_seconds': round(self._run_seconds / finished, 6) if finished else 0.0
+        }
+
+    async def serve_unix(self, path: str = SERVICE_SOCKET_PATH) -> None:
+        """Accept jobs as JSON lines on a Unix socket until cancelled.
+
+        Each request line is {"kind": ..., ...payload} and gets one response
+        line, {"ok": true, "result": ...} or {"ok": false, "error": ...}.
+        The kind "metrics" returns metrics() without queueing a job. A full
+        queue delays reading the next request, so clients slow down instead
+        of piling up jobs.
+        """
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self._handle_connection, path)
+        logger.info(f"Pipeline service listening on {path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    kind = request.pop('kind')
+                    if kind == 'metrics':
+                        result = self.metrics()
+                    else:
+                        result = _to_json(await self.submit(kind, **request))
+                    response = {'ok': True, 'result': result}
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e) or type(e).__name__}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+def _to_json(result):
+    if isinstance(result, list):
+        return [article.to_dict() for article in result]
+    return result
+
+def send_job(request: Dict, path: str = SERVICE_SOCKET_PATH, timeout: float = None) -> Dict:
+    """Send one request to a running service's Unix socket and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(path)
+        client.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with client.makefile('rb') as responses:
+            return json.loads(responses.readline())
@@ -0,0 +1,140 @@
+"""
+Batch TF-IDF cosine similarity for duplicate detection.
+"""
+import math
+import zlib
+from collections import Counter, defaultdict
+from typing import Dict, List
+from models import Article
+from matching import tokenize
+from config import (
+    TFIDF_FEATURES, TFIDF_BLOCK_SIZE, TFIDF_SIMILARITY_THRESHOLD, TFIDF_TITLE_WEIGHT, TFIDF_BLOCK_CACHE_BYTES
+)
+
+try:
+    import numpy as np
+except ImportError:  # Optional; a pure-Python sparse path is used instead
+    np = None
+
+class TfidfSimilarity:
+    """Finds article pairs whose hashed TF-IDF vectors have a high cosine similarity.
+
+    Unlike calculate_similarity, vectors cover the title and the full
+    content, so rewrites that keep a story's body still match. Tokens are
+    hashed into num_features dimensions (the hashing trick), so no
+    vocabulary is kept; title tokens count title_weight times.
+
+    Vectors are built once per batch. With NumPy, similarities are computed
+    block_size rows at a time as dense matrix products; without it, sparse
+    vectors are compared through an inverted index, which suits small
+    batches. Both paths return the same pairs, up to float32 rounding at
+    the threshold.
+
+    Dense blocks are built once and reused across row passes while they
+    fit in block_cache_bytes; blocks beyond that are rebuilt when needed.
+    """
+
+    def __init__(self, num_features: int = TFIDF_FEATURES,
+                 threshold: float = TFIDF_SIMILARITY_THRESHOLD,
+                 block_size: int = TFIDF_BLOCK_SIZE,
+                 title_weight: int = TFIDF_TITLE_WEIGHT,
+                 block_cache_bytes: int = TFIDF_BLOCK_CACHE_BYTES):
+        self.num_features = num_features
+        self.threshold = threshold
+        self.block_size = block_size
+        self.title_weight = title_weight
+        self.block_cache_bytes = block_cache_bytes
+
+    def _features(self, article: Article) -> Counter:
+        num_features = self.num_features
+        counts = Counter()
+        for token in tokenize(article.title.lower()):
+            counts[zlib.crc32(token.encode('utf-8')) % num_features] += self.title_weight
+        for token in tokenize(article.content.lower()):
+            counts[zlib.crc32(token.encode('utf-8')) % num_features] += 1
+        return counts
+
+    def vectorize(self, articles: List[Article]) -> List[Dict[int, float]]:
+        """L2-normalized sparse TF-IDF vectors, as {feature: weight}."""
+        counts = [self._features(article) for article in articles]
+        document_frequency = Counter()
+        for features in counts:
+            document_frequency.update(features.keys())
+
+        # Smoothed IDF with sublinear term frequency
+        total = len(articles)
+        idf = {feature: math.log((1 + total) / (1 + frequency)) + 1
+               for feature, frequency in document_frequency.items()}
+        vectors = []
+        for features in counts:
+            vector = {feature: (1 + math.log(count)) * idf[feature] for feature, count in features.items()}
+            norm = math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0
+            vectors.append({feature: weight / norm for feature, weight in vector.items()})
+        return vectors
+
+    def similar_pairs(self, articles: List[Article]) -> Dict[int, List[int]]:
+        """Map each article index to the later indices at or above the threshold."""
+        vectors = self.vectorize(articles)
+        if np is not None:
+            pairs = self._numpy_pairs(vectors)
+        else:
+            pairs = self._sparse_pairs(vectors)
+        return {i: sorted(later) for i, later in pairs.items()}
+
+    def _sparse_pairs(self, vectors: List[Dict[int, float]]) -> Dict[int, List[int]]:
+        pairs = defaultdict(list)
+        postings = defaultdict(list)  # feature -> [(earlier index, weight)]
+        for i, vector in enumerate(vectors):
+            dots = defaultdict(float)
+            for feature, weight in vector.items():
+                for j, other_weight in postings[feature]:
+                    dots[j] += weight * other_weight
+            for j, dot in dots.items():
+                if dot >= self.threshold:
+                    pairs[j].append(i)
+            for feature, weight in vector.items():
+                postings[feature].append((i, weight))
+        return pairs
+
+    def _numpy_pairs(self, vectors: List[Dict[int, float]]) -> Dict[int, List[int]]:
+        # CSR layout of the whole batch; dense blocks are built from it on demand
+        lengths = np.fromiter((len(vector) for vector in vectors), dtype=np.int64, count=len(vectors))
+        indptr = np.zeros(len(vectors) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.fromiter((feature for vector in vectors for feature in vector),
+                              dtype=np.int64, count=int(indptr[-1]))
+        values = np.fromiter((weight for vector in vectors for weight in vector.values()),
+                             dtype=np.float32, count=int(indptr[-1]))
+
+        def dense(start: int, stop: int):
+            block = np.zeros((stop - start, self.num_features), dtype=np.float32)
+            rows = np.repeat(np.arange(stop - start), lengths[start:stop])
+            block[rows, indices[indptr[start]:indptr[stop]]] = values[indptr[start]:indptr[stop]]
+            return block
+
+        size = self.block_size
+        cached_blocks = self.block_cache_bytes // (size * self.num_features * 4)
+        blocks = {}
+
+        def block(start: int):
+            cached = blocks.get(start)
+            if cached is not None:
+                return cached
+            built = dense(start, min(start + size, len(vectors)))
+            if len(blocks) < cached_blocks:
+                blocks[start] = built
+            return built
+
+        pairs = defaultdict(list)
+        for row_start in range(0, len(vectors), size):
+            row_block = block(row_start)
+            for column_start in range(row_start, len(vectors), size):
+                column_block = block(column_start)
+                similarities = row_block @ column_block.T
+                if column_start == row_start:
+                    similarities = np.triu(similarities, k=1)
+                for i, j in zip(*np.nonzero(similarities >= self.threshold)):
+                    pairs[row_start + int(i)].append(column_start + int(j))
+            # Earlier blocks are never used as columns again
+            blocks.pop(row_start, None)
+        return pairs
@@ -0,0 +1,88 @@
+"""
+Seeded synthetic article corpora for benchmarking the pipeline at scale.
+"""
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+from models import Article, NewsCategory
+from config import CATEGORY_KEYWORDS, SENTIMENT_KEYWORDS
+
+FILLER_WORDS = [
+    'officials', 'said', 'new', 'report', 'week', 'year', 'plans', 'markets', 'analysts',
+    'companies', 'local', 'leaders', 'according', 'sources', 'expected', 'data', 'after',
+    'before', 'city', 'country', 'announced', 'today', 'latest', 'public', 'industry'
+]
+
+SYNTHETIC_SOURCES = ['Synthetic', 'Synthetic Wire', 'Synthetic Daily', 'Synthetic Times']
+
+_SYLLABLES = [consonant + vowel + coda for consonant in 'bcdfghjklmnprstvwz'
+              for vowel in 'aeiou' for coda in ('', 'n')]
+
+# Originals remembered as templates for near-duplicates
+_RECENT_ORIGINALS = 1000
+
+def _category_vocabulary(category: NewsCategory) -> List[str]:
+    words = []
+    for keywords in CATEGORY_KEYWORDS.get(category, {}).values():
+        words.extend(keywords)
+    return words
+
+def _background_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Filler, sentiment and pronounceable made-up words; a large vocabulary
+    keeps unrelated articles from looking alike to duplicate detection."""
+    words = FILLER_WORDS + SENTIMENT_KEYWORDS['positive'] + SENTIMENT_KEYWORDS['negative']
+    made_up = set()
+    while len(made_up) < size:
+        made_up.add(''.join(rng.choices(_SYLLABLES, k=rng.randint(2, 4))))
+    return words + sorted(made_up)
+
+def generate_synthetic_articles(count: int, seed: int = 42, duplicate_rate: float = 0.1,
+                                keyword_density: float = 0.05,
+                                category_weights: Dict[NewsCategory, float] = None,
+                                content_words: Tuple[int, int] = (30, 60),
+                                title_words: Tuple[int, int] = (6, 12),
+                                start_date: datetime = datetime(2024, 1, 1),
+                                span_days: int = 30,
+                                vocabulary_size: int = 5000) -> Iterator[Article]:
+    """Lazily yield a reproducible corpus of count articles.
+
+    duplicate_rate is the fraction of articles that are lightly edited copies
+    of a recent original; keyword_density is the fraction of words drawn from
+    the category's scoring keywords (the rest is filler and sentiment words).
+    Articles are generated one at a time, so corpora of millions never need
+    to be held in memory at once.
+    """
+    rng = random.Random(seed)
+    categories = list(category_weights or NewsCategory)
+    weights = [category_weights[category] for category in categories] if category_weights else None
+    vocabularies = {category: _category_vocabulary(category) or FILLER_WORDS for category in categories}
+    background = _background_vocabulary(rng, vocabulary_size)
+    span_minutes = span_days * 24 * 60
+    recent = deque(maxlen=_RECENT_ORIGINALS)
+
+    def words(category: NewsCategory, length: int) -> List[str]:
+        keywords = vocabularies[category]
+        return [rng.choice(keywords) if rng.random() < keyword_density else rng.choice(background)
+                for _ in range(length)]
+
+    for number in range(count):
+        if recent and rng.random() < duplicate_rate:
+            # Near-duplicate: a word or two swapped, republished a little later
+            original_title, original_content, category, published = rng.choice(recent)
+            title = list(original_title)
+            content = list(original_content)
+            for _ in range(rng.randint(1, 2)):
+                title[rng.randrange(len(title))] = rng.choice(background)
+                content[rng.randrange(len(content))] = rng.choice(background)
+            published += timedelta(minutes=rng.randint(1, 120))
+        else:
+            category = rng.choices(categories, weights)[0]
+            title = words(category, rng.randint(*title_words))
+            content = words(category, rng.randint(*content_words))
+            published = start_date + timedelta(minutes=rng.randint(0, span_minutes))
+            recent.append((title, content, category, published))
+
+        yield Article(' '.join(title).title(), SYNTHETIC_SOURCES[number % len(SYNTHETIC_SOURCES)],
+                      published, ' '.join(content), category, [],
+                      url=f"https://synthetic.example/{seed}/{number}")
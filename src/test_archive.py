@@ -0,0 +1,45 @@
+"""
+Tests for archive recovery and compaction.
+"""
+import os
+from datetime import timedelta
+import pytest
+from archive import ArticleArchive
+from synthetic import generate_synthetic_articles
+
+@pytest.fixture
+def articles():
+    return sorted(generate_synthetic_articles(40, seed=2), key=lambda article: article.publication_date)
+
+def test_records_past_the_heap_end_are_dropped(tmp_path, articles):
+    path = str(tmp_path / 'articles.archive')
+    with ArticleArchive(path) as archive:
+        archive.extend(articles)
+    # An index flush that landed on disk before the heap flush
+    os.truncate(f"{path}.heap", os.path.getsize(f"{path}.heap") - 10)
+
+    with ArticleArchive(path) as archive:
+        assert len(archive) == len(articles) - 1
+        assert archive.get(len(archive) - 1).content == articles[-2].content
+        archive.append(articles[-1])
+        assert archive.get(len(archive) - 1).content == articles[-1].content
+
+def test_compaction_switches_generations(tmp_path, articles):
+    path = str(tmp_path / 'articles.archive')
+    now = articles[-1].publication_date
+    kept = [article for article in articles if article.publication_date >= now - timedelta(days=10)]
+    with ArticleArchive(path) as archive:
+        archive.extend(articles)
+    # Leftovers of a compaction that stopped before switching
+    with open(f"{path}.1.idx", 'wb') as f:
+        f.write(b'partial')
+
+    with ArticleArchive(path) as archive:
+        assert archive.compact(retention_days=10, now=now) == len(articles) - len(kept)
+        assert [archive.get(article_id).title for article_id in range(len(archive))] == \
+            [article.title for article in kept]
+    assert sorted(os.listdir(tmp_path)) == ['articles.archive.1.heap', 'articles.archive.1.idx',
+                                            'articles.archive.1.sources', 'articles.archive.manifest']
+
+    with ArticleArchive(path) as archive:
+        assert len(archive) == len(kept)
@@ -0,0 +1,37 @@
+"""
+Tests for the columnar ArticleBatch paths of NewsFilter.
+"""
+import pytest
+from filters import NewsFilter
+from models import ArticleBatch, NewsCategory
+from synthetic import generate_synthetic_articles
+
+@pytest.fixture(scope='module')
+def articles():
+    return list(generate_synthetic_articles(500, seed=4))
+
+@pytest.mark.parametrize('categories, source_count', [
+    ([NewsCategory.FINANCE, NewsCategory.POLITICS], 2),
+    ([NewsCategory.TECHNOLOGY], 0),
+    (None, 1),
+])
+def test_filter_batch_matches_article_filters(articles, categories, source_count):
+    news_filter = NewsFilter()
+    sources = sorted({article.source for article in articles})[:source_count] or None
+    filtered = news_filter.filter_batch(ArticleBatch.from_articles(articles), categories, sources)
+
+    expected = news_filter.filter_by_source(news_filter.filter_by_category(articles, categories), sources)
+    assert [article.to_dict() for article in filtered.iter_articles()] == \
+        [article.to_dict() for article in expected]
+
+def test_filtered_batch_scores_like_articles(articles):
+    news_filter = NewsFilter()
+    batch = news_filter.score_batch(news_filter.filter_batch(ArticleBatch.from_articles(articles),
+                                                             [NewsCategory.FINANCE]))
+    expected = [news_filter.score_article(article) for article in articles
+                if article.category == NewsCategory.FINANCE]
+    assert list(batch.scores) == [article.relevance_score for article in expected]
+
+def test_process_articles_rejects_batches(articles):
+    with pytest.raises(TypeError, match='filter_batch'):
+        NewsFilter().process_articles(ArticleBatch.from_articles(articles))
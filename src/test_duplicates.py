@@ -0,0 +1,39 @@
+"""
+Tests that duplicate clusters do not depend on the order articles arrive in.
+"""
+import random
+from datetime import timedelta
+import pytest
+from filters import NewsFilter
+from synthetic import generate_synthetic_articles
+
+def _clusters(groups) -> set:
+    return {frozenset(id(article) for article in group) for group in groups}
+
+@pytest.mark.parametrize('method, size, window', [
+    ('exact', 50, None),
+    ('exact', 50, timedelta(hours=1)),
+    ('lsh', 600, None),
+    ('lsh', 600, timedelta(hours=1)),
+    ('tfidf', 600, None),
+])
+def test_clusters_are_identical_after_shuffling(method, size, window):
+    articles = list(generate_synthetic_articles(size, seed=6, duplicate_rate=0.4))
+    news_filter = NewsFilter()
+    expected = _clusters(news_filter.detect_duplicates(articles, method, window))
+    assert any(len(cluster) > 2 for cluster in expected)
+
+    rng = random.Random(0)
+    for _ in range(3):
+        shuffled = list(articles)
+        rng.shuffle(shuffled)
+        assert _clusters(news_filter.detect_duplicates(shuffled, method, window)) == expected
+
+def test_kept_articles_are_identical_after_shuffling():
+    articles = list(generate_synthetic_articles(600, seed=8, duplicate_rate=0.4))
+    news_filter = NewsFilter()
+    expected = {id(article) for article in news_filter.process_articles(articles)}
+
+    shuffled = list(articles)
+    random.Random(1).shuffle(shuffled)
+    assert {id(article) for article in news_filter.process_articles(shuffled)} == expected
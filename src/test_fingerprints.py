@@ -0,0 +1,43 @@
+"""
+Tests for cross-run duplicate detection with the persistent fingerprint index.
+"""
+from datetime import timedelta
+import pytest
+from config import SIMILARITY_THRESHOLD
+from filters import NewsFilter
+from fingerprints import FingerprintIndex
+from synthetic import generate_synthetic_articles
+
+@pytest.fixture
+def index(tmp_path):
+    with FingerprintIndex(str(tmp_path / 'fingerprints.db'), ttl_hours=10 ** 6) as index:
+        yield index
+
+def test_second_run_drops_rewrites_of_published_stories(index):
+    articles = list(generate_synthetic_articles(200, seed=11, duplicate_rate=0.4))
+    first_run, second_run = articles[:100], articles[100:]
+
+    first_filter = NewsFilter(fingerprint_index=index, dedup_method='lsh')
+    first_filter.process_articles(first_run)
+    assert len(index) == len(first_run)  # Removed duplicates are recorded as well
+
+    second_filter = NewsFilter(fingerprint_index=index, dedup_method='lsh')
+    published = {id(article) for article in second_run
+                 if any(second_filter._symmetric_similarity(article, earlier) >= SIMILARITY_THRESHOLD
+                        for earlier in first_run)}
+    assert len(published) > 5
+
+    kept = second_filter.process_articles(second_run)
+    assert [article.title for article in kept if id(article) in published] == []
+
+def test_repeated_feed_is_dropped_by_key(index):
+    articles = list(generate_synthetic_articles(50, seed=3, duplicate_rate=0.3))
+    assert NewsFilter(fingerprint_index=index).process_articles(articles)
+    assert NewsFilter(fingerprint_index=index).process_articles(articles) == []
+
+def test_expired_articles_are_evicted(index):
+    articles = list(generate_synthetic_articles(20, seed=5, duplicate_rate=0.0))
+    index.add(articles)
+    newest = max(article.publication_date for article in articles)
+    assert index.evict_expired(newest + timedelta(hours=10 ** 6 + 1)) == len(articles)
+    assert len(index) == 0
@@ -0,0 +1,126 @@
+"""
+Tests for the HTTP feed fetcher against a local stub server.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from fetcher import FetchEngine
+from http_fetch import FeedStateStore, HttpFetcher
+from models import NewsSource
+
+def _record(index: int) -> dict:
+    return {
+        'title': f"Story {index}",
+        'source': 'Stub',
+        'publication_date': (datetime(2024, 1, 1) + timedelta(hours=index)).isoformat(),
+        'content': f"Body of story {index}.",
+        'category': 'Technology',
+        'url': f"https://stub.example/{index}"
+    }
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        if server.delays:
+            time.sleep(server.delays.pop(0))
+        etag = f'"{server.version}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            body = b''.join(json.dumps(record).encode('utf-8') + b'\n' for record in server.records)
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        # Drop the keep-alive connection without announcing it, as idle timeouts do
+        self.close_connection = server.drop_connections
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _FeedHandler)
+    httpd.daemon_threads = True
+    httpd.records = [_record(index) for index in reversed(range(10))]  # Newest first
+    httpd.version = 1
+    httpd.delays = []
+    httpd.drop_connections = False
+    httpd.requests = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+@pytest.fixture
+def source():
+    return NewsSource('Stub', 0.9, [])
+
+def _fetcher(server, state_path=None) -> HttpFetcher:
+    url = f"http://127.0.0.1:{server.server_address[1]}/feed.jsonl"
+    return HttpFetcher({'Stub': url}, FeedStateStore(state_path), timeout=5.0)
+
+def test_unchanged_feed_is_not_modified(server, source, tmp_path):
+    state_path = tmp_path / 'state.json'
+    with _fetcher(server, str(state_path)) as fetcher:
+        assert [article.title for article in fetcher.fetch(source)] == [f"Story {index}" for index in range(9, -1, -1)]
+        assert fetcher.fetch(source) == []
+        stats = fetcher.stats()
+    assert stats['requests'] == 2
+    assert stats['not_modified'] == 1
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 1
+    assert json.loads(state_path.read_text())['Stub']['cursor'] == 'https://stub.example/9'
+
+    # A restarted fetcher picks the validators up from the state file
+    with _fetcher(server, str(state_path)) as fetcher:
+        assert fetcher.fetch(source) == []
+
+def test_changed_feed_stops_at_cursor(server, source):
+    with _fetcher(server) as fetcher:
+        assert len(fetcher.fetch(source)) == 10
+        server.records = [_record(index) for index in reversed(range(13))]
+        server.version = 2
+        assert [article.title for article in fetcher.fetch(source)] == ['Story 12', 'Story 11', 'Story 10']
+        assert fetcher.stats()['records_parsed'] == 10 + 4
+
+def test_malformed_record_is_skipped(server, source):
+    server.records.insert(3, {**_record(6), 'publication_date': 1e20, 'url': 'https://stub.example/bad'})
+    with _fetcher(server) as fetcher:
+        assert len(fetcher.fetch(source)) == 10
+        assert fetcher.fetch(source) == []
+
+def test_reused_connection_closed_by_server_is_retried(server, source):
+    server.drop_connections = True
+    with _fetcher(server) as fetcher:
+        assert len(fetcher.fetch(source)) == 10
+        time.sleep(0.1)  # Let the server close the idle connection
+        server.records = [_record(index) for index in reversed(range(11))]
+        server.version = 2
+        assert [article.title for article in fetcher.fetch(source)] == ['Story 10']
+        stats = fetcher.stats()
+    assert stats['connections_reused'] == 1
+    assert stats['connections_opened'] == 2
+    assert stats['requests'] == 2
+
+def test_timed_out_fetch_does_not_consume_articles(server, source):
+    # The first response outlives the engine timeout but completes before the retry starts
+    server.delays = [0.5]
+    with _fetcher(server) as fetcher:
+        engine = FetchEngine(fetcher, timeout=0.2, retries=1, backoff=0.6)
+        assert len(engine.fetch_all([source])) == 10
+        assert source.fetch_failures == 1
+        assert server.requests == 2
+        assert engine.fetch_all([source]) == []
+        assert fetcher.stats()['not_modified'] == 1
@@ -0,0 +1,29 @@
+"""
+Tests for JSON Lines feed reading.
+"""
+import gzip
+import json
+import pytest
+from ingest import FeedReader
+
+def _valid(index: int) -> dict:
+    return {'title': f"Story {index}", 'source': 'Stub', 'publication_date': '2024-01-01T12:00:00',
+            'content': f"Body of story {index}.", 'category': 'Technology'}
+
+@pytest.mark.parametrize('bad_record', [
+    {**_valid(0), 'publication_date': 1e20},  # Out of range for datetime
+    {**_valid(0), 'publication_date': float('inf')},
+    {**_valid(0), 'publication_date': 'not a date'},
+    {**_valid(0), 'category': 'Astrology'},
+    {'title': 'No other fields'},
+])
+@pytest.mark.parametrize('compressed', [False, True])
+def test_malformed_records_are_skipped(tmp_path, bad_record, compressed):
+    lines = [json.dumps(record) for record in (_valid(1), bad_record, _valid(2))] + ['{not json']
+    path = tmp_path / ('feed.jsonl.gz' if compressed else 'feed.jsonl')
+    with (gzip.open if compressed else open)(path, 'wt', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    reader = FeedReader(str(path))
+    assert [article.title for article in reader] == ['Story 1', 'Story 2']
+    assert reader.errors == 2
@@ -0,0 +1,95 @@
+"""
+Tests that compiled keyword matching scores exactly like per-keyword regex scans.
+"""
+import random
+import re
+import pytest
+from matching import AnalyzedText, KeywordMatcher, RelevanceScorer, SentimentLexicon
+from models import Article, NewsCategory, Sentiment
+from config import CATEGORY_KEYWORDS, KEYWORD_WEIGHTS, SENTIMENT_KEYWORDS
+from synthetic import generate_synthetic_articles
+
+# Keywords that are prefixes of, contained in, or overlap with one another
+OVERLAPPING_KEYWORDS = ['ai', 'ai research', 'research', 'air', 'aid', 'aba', 'ab', 'abab',
+                        'new york', 'york', 'new', 'c++', 'c', 'u.s.', 'u.s', 'breakthrough',
+                        'medical breakthrough', 'x_y', 'x']
+PIECES = OVERLAPPING_KEYWORDS + ['a', 'b', 'resear', 'ch', 'yorker', 'medical', 'through', '_', '+']
+SEPARATORS = [' ', ' ', ' ', '', '-', '.', ', ', '+']
+
+def _reference_count(keyword: str, text: str) -> int:
+    return len(re.findall(rf'\b{re.escape(keyword.lower())}\b', text))
+
+def _reference_relevance(article: Article, category_keywords=CATEGORY_KEYWORDS,
+                         keyword_weights=KEYWORD_WEIGHTS) -> float:
+    """The original per-keyword regex scoring."""
+    score = 0.0
+    text_content = f"{article.title} {article.content}".lower()
+    keywords_by_priority = category_keywords.get(article.category, {})
+    for priority, keywords in keywords_by_priority.items():
+        weight = keyword_weights.get(priority, 1.0)
+        for keyword in keywords:
+            score += _reference_count(keyword, text_content) * weight
+
+    title_lower = article.title.lower()
+    for priority, keywords in keywords_by_priority.items():
+        weight = keyword_weights.get(priority, 1.0)
+        for keyword in keywords:
+            if keyword.lower() in title_lower:
+                score += weight * 1.5
+
+    if len(article.content) > 0:
+        score = score / (len(article.content) / 100)
+    return round(score, 2)
+
+def _reference_sentiment(article: Article) -> Sentiment:
+    text_content = f"{article.title} {article.content}".lower()
+    positive_score = sum(_reference_count(keyword, text_content) for keyword in SENTIMENT_KEYWORDS['positive'])
+    negative_score = sum(_reference_count(keyword, text_content) for keyword in SENTIMENT_KEYWORDS['negative'])
+    if positive_score > negative_score:
+        return Sentiment.POSITIVE
+    elif negative_score > positive_score:
+        return Sentiment.NEGATIVE
+    return Sentiment.NEUTRAL
+
+def _random_text(rng: random.Random, pieces) -> str:
+    parts = []
+    for _ in range(rng.randint(0, 30)):
+        parts.append(rng.choice(pieces))
+        parts.append(rng.choice(SEPARATORS))
+    return ''.join(parts)
+
+@pytest.mark.parametrize('seed', range(5))
+def test_counts_match_per_keyword_scans(seed):
+    rng = random.Random(seed)
+    matcher = KeywordMatcher(OVERLAPPING_KEYWORDS)
+    for _ in range(400):
+        text = _random_text(rng, PIECES)
+        expected = {keyword: _reference_count(keyword, text) for keyword in OVERLAPPING_KEYWORDS}
+        expected = {keyword: count for keyword, count in expected.items() if count}
+        assert matcher.count(text) == expected, text
+        assert matcher.count(text, AnalyzedText('', text).token_counts) == expected, text
+        assert matcher.present(text) == {keyword for keyword in OVERLAPPING_KEYWORDS if keyword in text}, text
+
+def test_overlapping_config_scores_like_regex_scans():
+    # Repeated keywords across tiers are weighted once per entry
+    category_keywords = {NewsCategory.TECHNOLOGY: {
+        'high_priority': ['AI research', 'breakthrough', 'new york'],
+        'medium_priority': ['AI', 'medical breakthrough', 'C++', 'ai'],
+        'low_priority': ['research', 'york', 'u.s.'],
+    }}
+    scorer = RelevanceScorer(category_keywords, KEYWORD_WEIGHTS)
+    rng = random.Random(0)
+    for _ in range(500):
+        article = Article(_random_text(rng, PIECES).title(), 'Test', None,
+                          _random_text(rng, PIECES), NewsCategory.TECHNOLOGY, [])
+        assert scorer.score(article) == _reference_relevance(article, category_keywords), article.content
+
+def test_synthetic_articles_score_like_regex_scans():
+    scorer = RelevanceScorer()
+    lexicon = SentimentLexicon()
+    scored = 0
+    for article in generate_synthetic_articles(1000, seed=9, keyword_density=0.3):
+        assert scorer.score(article) == _reference_relevance(article)
+        assert lexicon.classify(AnalyzedText.from_article(article)) == _reference_sentiment(article)
+        scored += scorer.score(article) > 0
+    assert scored > 900
@@ -0,0 +1,28 @@
+"""
+Tests for the TF-IDF similarity backends.
+"""
+import pytest
+import similarity
+from similarity import TfidfSimilarity
+from synthetic import generate_synthetic_articles
+
+np = pytest.importorskip('numpy')
+
+@pytest.fixture(scope='module')
+def articles():
+    return list(generate_synthetic_articles(1500, seed=7, duplicate_rate=0.2))
+
+@pytest.mark.parametrize('block_size, block_cache_bytes', [
+    (200, 2 ** 30),  # Every block cached
+    (200, 3 * 200 * 4096 * 4),  # Some blocks rebuilt
+    (200, 0),  # Nothing cached
+    (4096, 2 ** 30),  # A single block
+])
+def test_numpy_pairs_match_sparse_pairs(monkeypatch, articles, block_size, block_cache_bytes):
+    tfidf = TfidfSimilarity(block_size=block_size, block_cache_bytes=block_cache_bytes)
+    with_numpy = tfidf.similar_pairs(articles)
+    monkeypatch.setattr(similarity, 'np', None)
+    without_numpy = tfidf.similar_pairs(articles)
+
+    assert with_numpy == without_numpy
+    assert sum(len(later) for later in with_numpy.values()) > 100
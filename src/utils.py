@@ -4,23 +4,33 @@ Utility functions for the news aggregation system.
 import time
 import random
 import logging
-from typing import List
+from typing import Callable, List, TextIO, Tuple
 from config import SIMULATION_DELAY_RANGE
 
 logger = logging.getLogger(__name__)
 
+def _simulated_fetch_steps(source_name: str, article_count: int) -> List[Tuple[str, float]]:
+    """Progress messages of a simulated fetch, each with the pause that follows it."""
+    delay = random.uniform(*SIMULATION_DELAY_RANGE)
+    return [
+        (f"🌐 Connecting to {source_name}...", delay * 0.3),
+        (f"📡 Fetching articles from {source_name}...", delay * 0.4),
+        (f"✅ Retrieved {article_count} article(s) from {source_name}", delay * 0.3)
+    ]
+
 def simulate_api_fetch(source_name: str, article_count: int = 1) -> None:
     """Simulate API fetching with realistic delays and messages."""
-    delay = random.uniform(*SIMULATION_DELAY_RANGE)
-    
-    print(f"🌐 Connecting to {source_name}...")
-    time.sleep(delay * 0.3)
-    
-    print(f"📡 Fetching articles from {source_name}...")
-    time.sleep(delay * 0.4)
+    for message, pause in _simulated_fetch_steps(source_name, article_count):
+        print(message)
+        time.sleep(pause)
+
+async def simulate_api_fetch_async(source_name: str, article_count: int = 1) -> None:
+    """Simulate API fetching without blocking other concurrent fetches."""
+    import asyncio  # Already loaded by the running event loop; keeps utils cheap to import
     
-    print(f"✅ Retrieved {article_count} article(s) from {source_name}")
-    time.sleep(delay * 0.3)
+    for message, pause in _simulated_fetch_steps(source_name, article_count):
+        print(message)
+        await asyncio.sleep(pause)
 
 def setup_logging(log_level: str = 'INFO') -> None:
     """Set up logging configuration."""
@@ -36,7 +46,7 @@ def print_processing_step(step_name: str, details: str = '') -> None:
     if details:
         print(f"   {details}")
 
-def print_statistics(articles: List, duplicate_count: int = 0) -> None:
+def print_statistics(articles: List, duplicate_count: int = 0, profiler=None) -> None:
     """Print processing statistics."""
     print(f"\n📊 PROCESSING STATISTICS:")
     print(f"   Total articles processed: {len(articles)}")
@@ -53,6 +63,22 @@ def print_statistics(articles: List, duplicate_count: int = 0) -> None:
         print(f"   Articles by category:")
         for category, count in category_counts.most_common():
             print(f"     - {category}: {count}")
+    
+    if profiler is not None and profiler.enabled:
+        print_profile_report(profiler)
+
+def print_profile_report(profiler) -> None:
+    """Print per-stage timings and counters collected by a PipelineProfiler."""
+    report = profiler.report()
+    print(f"\n⏱️  STAGE TIMINGS:")
+    print(f"   {'stage':<16} {'calls':>6} {'wall ms':>10} {'cpu ms':>10} {'items/s':>12}")
+    for name, stats in report['stages'].items():
+        print(f"   {name:<16} {stats['calls']:>6} {stats['wall_seconds'] * 1000:>10.2f} "
+              f"{stats['cpu_seconds'] * 1000:>10.2f} {stats['items_per_second']:>12.0f}")
+    for name, value in report['counters'].items():
+        print(f"   {name}: {value}")
+    if report['peak_memory_bytes']:
+        print(f"   Peak memory: {report['peak_memory_bytes'] / 2 ** 20:.1f} MiB")
 
 def print_banner() -> None:
     """Print application banner."""
@@ -70,6 +96,16 @@ def save_to_file(content: str, filename: str) -> None:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(content)
         print(f"💾 Content saved to {filename}")
+    except Exception as e:
+        logger.error(f"Failed to save file {filename}: {e}")
+        print(f"❌ Failed to save {filename}: {e}")
+
+def stream_to_file(write: Callable[[TextIO], None], filename: str) -> None:
+    """Save content produced incrementally by write(file) to a file."""
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            write(f)
+        print(f"💾 Content saved to {filename}")
     except Exception as e:
         logger.error(f"Failed to save file {filename}: {e}")
         print(f"❌ Failed to save {filename}: {e}")
\ No newline at end of file